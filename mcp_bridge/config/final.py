@@ -3,7 +3,7 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import BaseModel, Field
 
 from mcp.client.stdio import StdioServerParameters
-from mcpx.client.transports.docker import DockerMCPServer
+from mcpx.client.transports.docker import DockerMCPServer as DockerServerParameters
 
 
 class InferenceServer(BaseModel):
@@ -38,17 +38,241 @@ class Sampling(BaseModel):
     ] = []
 
 
-class SSEMCPServer(BaseModel):
+class Reconnect(BaseModel):
+    initial_delay: Annotated[
+        float, Field(description="Seconds to wait before the first restart of a failed session")
+    ] = 0.5
+    max_delay: Annotated[float, Field(description="Upper bound on the restart delay in seconds")] = 60
+    multiplier: Annotated[float, Field(description="Factor the delay grows by after each failed restart")] = 2
+    jitter: Annotated[
+        float,
+        Field(description="Fraction of the delay that is randomised, so servers do not restart in lockstep"),
+    ] = 0.5
+    crash_loop_threshold: Annotated[
+        int,
+        Field(description="Consecutive failed restarts after which the server is reported unhealthy"),
+    ] = 5
+    stable_after: Annotated[
+        float,
+        Field(description="Seconds a session has to stay up before the backoff and health are reset"),
+    ] = 30
+
+
+class Timeouts(BaseModel):
+    tool_call: Annotated[
+        float | None, Field(description="Default seconds a tool call may take, null for no limit")
+    ] = 60
+    request: Annotated[
+        float | None,
+        Field(description="Default seconds for listing, reading resources and getting prompts, null for no limit"),
+    ] = 30
+
+
+class ToolCatalog(BaseModel):
+    ttl: Annotated[
+        int,
+        Field(
+            description="Seconds before the tool catalog is revalidated against the MCP servers in the background"
+        ),
+    ] = 300
+
+
+class FanOut(BaseModel):
+    timeout: Annotated[
+        float,
+        Field(description="Deadline in seconds for each server when listing across all servers"),
+    ] = 5
+    skip_offline: Annotated[
+        bool,
+        Field(description="Skip servers without a session instead of waiting for them"),
+    ] = True
+
+
+class ToolCalls(BaseModel):
+    max_parallel: Annotated[
+        int,
+        Field(description="Maximum tool calls from a single model turn that run concurrently"),
+    ] = 8
+    max_parallel_per_server: Annotated[
+        int,
+        Field(description="Default maximum concurrent tool calls to a single MCP server"),
+    ] = 4
+    speculative: Annotated[
+        bool,
+        Field(description="Start streamed tool calls as soon as their arguments are complete, before the model finishes"),
+    ] = False
+    max_parallel_batch: Annotated[
+        int,
+        Field(description="Maximum tool calls from a single /mcp/tools/batch request that run concurrently"),
+    ] = 32
+
+
+class ToolCache(BaseModel):
+    enabled: Annotated[bool, Field(description="Cache successful tool results")] = True
+    ttl: Annotated[float, Field(description="Seconds a cached result stays valid")] = 60
+    max_entries: Annotated[int, Field(description="Maximum number of cached results")] = 1000
+    max_bytes: Annotated[
+        int, Field(description="Maximum total size of the cached results in bytes")
+    ] = 10_000_000
+
+
+class ToolOptions(BaseModel):
+    """Options for a single tool, these take precedence over the server options"""
+
+    cache: Annotated[
+        ToolCache | None,
+        Field(description="Result cache for this tool, only use this for idempotent tools"),
+    ] = None
+    coalesce: Annotated[
+        bool | None,
+        Field(description="Share one in-flight call between identical concurrent calls, defaults to the server setting"),
+    ] = None
+    timeout: Annotated[
+        float | None,
+        Field(description="Seconds a call of this tool may take, defaults to the server setting"),
+    ] = None
+
+
+class Keepalive(BaseModel):
+    interval: Annotated[
+        float,
+        Field(description="Seconds between pings, pings are skipped while other requests succeed"),
+    ] = 10
+    failure_interval: Annotated[
+        float, Field(description="Seconds between pings after a ping failed")
+    ] = 2
+    max_failures: Annotated[
+        int, Field(description="Consecutive failed pings before the session is restarted")
+    ] = 2
+    timeout: Annotated[float, Field(description="Seconds to wait for a ping response")] = 5
+
+
+class McpServerOptions(BaseModel):
+    """Options shared by every MCP server type"""
+
+    max_parallel_calls: Annotated[
+        int | None,
+        Field(description="Maximum concurrent tool calls to this server, defaults to tool_calls.max_parallel_per_server"),
+    ] = None
+    cache: Annotated[
+        ToolCache | None,
+        Field(description="Result cache shared by all tools of this server, only use this if every tool is idempotent"),
+    ] = None
+    coalesce: Annotated[
+        bool,
+        Field(description="Share one in-flight call between identical concurrent calls, only use this if every tool is idempotent"),
+    ] = False
+    keepalive: Annotated[
+        Keepalive, Field(description="Pings that detect dead sessions")
+    ] = Keepalive()
+    tool_timeout: Annotated[
+        float | None,
+        Field(description="Seconds a tool call to this server may take, defaults to timeouts.tool_call"),
+    ] = None
+    request_timeout: Annotated[
+        float | None,
+        Field(description="Seconds for listing, reading resources and getting prompts, defaults to timeouts.request"),
+    ] = None
+    session_wait_timeout: Annotated[
+        float,
+        Field(description="Seconds a request waits for the server to (re)connect before failing"),
+    ] = 5
+    tools: Annotated[
+        dict[str, ToolOptions], Field(description="Options for individual tools")
+    ] = {}
+
+
+class SessionPool(BaseModel):
+    min: Annotated[int, Field(description="Sessions kept running at all times")] = 1
+    max: Annotated[int, Field(description="Upper bound on the number of sessions")] = 1
+    scale_up_queue_depth: Annotated[
+        float,
+        Field(description="Queued and running tool calls per session that start another session"),
+    ] = 2
+    idle_timeout: Annotated[
+        float,
+        Field(description="Seconds a session above the minimum may stay idle before it is stopped"),
+    ] = 60
+
+
+class PooledMcpServerOptions(McpServerOptions):
+    """Options for servers the bridge runs itself, so it can start several of them"""
+
+    lifecycle: Annotated[
+        Literal["eager", "lazy"],
+        Field(description="eager servers run from startup, lazy servers are only listed at startup and run from their first use"),
+    ] = "eager"
+    idle_timeout: Annotated[
+        float | None,
+        Field(description="Stop the server after this many seconds without use, it starts again on the next use"),
+    ] = None
+    start_timeout: Annotated[
+        float,
+        Field(description="Seconds to wait for a stopped server to start, on its first use and when a lazy server is listed at startup"),
+    ] = 60
+
+    pool_size: Annotated[
+        SessionPool,
+        Field(description="Number of sessions, each with its own process, to spread tool calls over"),
+    ] = SessionPool()
+
+
+class StdioMCPServer(StdioServerParameters, PooledMcpServerOptions):
+    pass
+
+
+class SSEMCPServer(McpServerOptions):
     # TODO: expand this once I find a good definition for this
     url: str = Field(description="URL of the MCP server")
+    transport: Literal["sse"] = Field("sse", description="Legacy HTTP+SSE transport")
+
+
+class StreamableHttpMCPServer(McpServerOptions):
+    url: str = Field(description="URL of the MCP endpoint")
+    transport: Literal["streamable_http"] = Field(
+        description="Streamable HTTP transport"
+    )
+    headers: dict[str, str] = Field({}, description="Headers sent with every request")
+    http2: bool = Field(
+        False, description="Use HTTP/2, needs the h2 package (pip install httpx[http2])"
+    )
+    timeout: float = Field(30, description="Timeout for each HTTP request in seconds")
+
+
+class DockerMCPServer(DockerServerParameters, PooledMcpServerOptions):
+    warm_standby: Annotated[
+        int,
+        Field(description="Started containers kept waiting, so a new or failed session is replaced without a cold start"),
+    ] = 0
 
 
 MCPServer = Annotated[
-    Union[StdioServerParameters, SSEMCPServer, DockerMCPServer],
+    Union[StdioMCPServer, SSEMCPServer, StreamableHttpMCPServer, DockerMCPServer],
     Field(description="MCP server configuration"),
 ]
 
 
+class SseServer(BaseModel):
+    buffer_size: Annotated[
+        int, Field(description="Messages buffered per SSE session in each direction")
+    ] = 100
+    overflow: Annotated[
+        Literal["block", "reject"],
+        Field(description="When a session buffer is full, make the POST wait (block) or answer 503 (reject)"),
+    ] = "block"
+    idle_timeout: Annotated[
+        float | None,
+        Field(description="Close SSE sessions without messages for this many seconds, null to keep them open"),
+    ] = 3600
+    relay: Annotated[
+        Literal["local", "unix"],
+        Field(description="Find the worker owning a session in-process (local) or through unix sockets shared by all workers (unix)"),
+    ] = "local"
+    relay_dir: Annotated[
+        str, Field(description="Directory for the session files and sockets of the unix relay")
+    ] = "/tmp/mcp-bridge-sse"
+
+
 class Network(BaseModel):
     host: str = Field("0.0.0.0", description="Host of the network")
     port: int = Field(8000, description="Port of the network")
@@ -99,11 +323,41 @@ class Settings(BaseSettings):
         description="sampling config",
     )
 
+    reconnect: Reconnect = Field(
+        default_factory=lambda: Reconnect.model_construct(),
+        description="config for restarting failed MCP server sessions",
+    )
+
+    timeouts: Timeouts = Field(
+        default_factory=lambda: Timeouts.model_construct(),
+        description="default timeouts for requests to MCP servers",
+    )
+
+    fan_out: FanOut = Field(
+        default_factory=lambda: FanOut.model_construct(),
+        description="config for listing across all MCP servers",
+    )
+
+    tool_calls: ToolCalls = Field(
+        default_factory=lambda: ToolCalls.model_construct(),
+        description="tool call execution config",
+    )
+
+    tool_catalog: ToolCatalog = Field(
+        default_factory=lambda: ToolCatalog.model_construct(),
+        description="tool catalog cache config",
+    )
+
     logging: Logging = Field(
         default_factory=lambda: Logging.model_construct(),
         description="logging config",
     )
 
+    sse_server: SseServer = Field(
+        default_factory=lambda: SseServer.model_construct(),
+        description="config for the SSE endpoint of the bridge MCP server",
+    )
+
     network: Network = Field(
         default_factory=lambda: Network.model_construct(),
         description="network config",
@@ -14,6 +14,10 @@ class HealthManager:
     def add_unhealthy_event(self, event: UnhealthyEvent) -> None:
         self.UnhealthyEvents.append(event)
 
+    def remove_unhealthy_events(self, name: str) -> None:
+        for event in [event for event in self.UnhealthyEvents if event.name == name]:
+            self.UnhealthyEvents.remove(event)
+
     def get_unhealthy_events(self) -> list[UnhealthyEvent]:
         return list(self.UnhealthyEvents)
 
@@ -1,5 +1,7 @@
 from contextlib import asynccontextmanager
 from mcp_bridge.mcp_clients.McpClientManager import ClientManager
+from mcp_bridge.mcp_clients.streamableHttp import close_http_clients
+from mcp_bridge.mcp_server.sse import sse
 from loguru import logger
 
 
@@ -17,5 +19,8 @@ async def lifespan(app):
     logger.log("DEBUG", "Returned form lifespan yield")
 
     # shutdown
+    await ClientManager.shutdown()
+    await close_http_clients()
+    await sse.close()
 
     logger.log("DEBUG", "Exiting fastapi lifespan")
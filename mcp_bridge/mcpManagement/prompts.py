@@ -1,5 +1,5 @@
 from typing import Any
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from mcp_bridge.mcp_clients.McpClientManager import ClientManager
 from mcp.types import ListPromptsResult, GetPromptResult
 
@@ -7,13 +7,16 @@ router = APIRouter(prefix="/prompts")
 
 
 @router.get("")
-async def get_prompts() -> dict[str, ListPromptsResult]:
+async def get_prompts(response: Response) -> dict[str, ListPromptsResult]:
     """Get all prompts from all MCP clients"""
 
-    prompts = {}
+    prompts, omitted = await ClientManager.fan_out(
+        lambda client: client.list_prompts(), ClientManager.prompts_snapshot
+    )
 
-    for name, client in ClientManager.get_clients():
-        prompts[name] = await client.list_prompts()
+    # servers that were offline or too slow are reported instead of blocking
+    if omitted:
+        response.headers["X-MCP-Omitted-Servers"] = ",".join(omitted)
 
     return prompts
 
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from mcp_bridge.mcp_clients.McpClientManager import ClientManager
 from mcp.types import ListResourcesResult
 
@@ -6,12 +6,15 @@ router = APIRouter(prefix="/resources")
 
 
 @router.get("")
-async def get_resources() -> dict[str, ListResourcesResult]:
+async def get_resources(response: Response) -> dict[str, ListResourcesResult]:
     """Get all resources from all MCP clients"""
 
-    resources = {}
+    resources, omitted = await ClientManager.fan_out(
+        lambda client: client.list_resources(), ClientManager.resources_snapshot
+    )
 
-    for name, client in ClientManager.get_clients():
-        resources[name] = await client.list_resources()
+    # servers that were offline or too slow are reported instead of blocking
+    if omitted:
+        response.headers["X-MCP-Omitted-Servers"] = ",".join(omitted)
 
     return resources
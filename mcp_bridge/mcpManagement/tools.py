@@ -1,23 +1,62 @@
-from typing import Any
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+from typing import Any, AsyncIterator
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from loguru import logger
+from pydantic import ValidationError
+from mcp_bridge.config import config
 from mcp_bridge.mcp_clients.McpClientManager import ClientManager
+from mcp_bridge.models.toolBatch import ToolBatchCall, ToolBatchResult
 from mcp.types import ListToolsResult, CallToolResult
 
 router = APIRouter(prefix="/tools")
 
+NDJSON = "application/x-ndjson"
+
 
 @router.get("")
-async def get_tools() -> dict[str, ListToolsResult]:
+async def get_tools(response: Response) -> dict[str, ListToolsResult]:
     """Get all tools from all MCP clients"""
 
-    tools = {}
+    tools, omitted = await ClientManager.fan_out(
+        lambda client: client.list_tools(), ClientManager.tools_snapshot
+    )
 
-    for name, client in ClientManager.get_clients():
-        tools[name] = await client.list_tools()
+    # servers that were offline or too slow are reported instead of blocking
+    if omitted:
+        response.headers["X-MCP-Omitted-Servers"] = ",".join(omitted)
 
     return tools
 
 
+@router.post("/batch", response_class=StreamingResponse)
+async def call_tools_batch(request: Request):
+    """
+    Call many tools in one request. The body is a JSON array or NDJSON of
+    `{"tool": ..., "arguments": {...}}`, the results are streamed back as NDJSON
+    in the order they finish, each with the index of its call.
+    """
+
+    # the body is read up front, the streaming response listens for the
+    # client disconnecting on the same channel
+    body = await request.body()
+
+    calls: list[Any]
+    if request.headers.get("content-type", "").startswith(NDJSON):
+        calls = [line for line in body.split(b"\n") if line.strip()]
+    else:
+        try:
+            calls = json.loads(body)
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+
+        if not isinstance(calls, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+
+    return StreamingResponse(_run_batch(calls), media_type=NDJSON)
+
+
 @router.post("/{tool_name}/call")
 async def call_tool(tool_name: str, arguments: dict[str, Any] = {}) -> CallToolResult:
     """Call a tool"""
@@ -27,3 +66,63 @@ async def call_tool(tool_name: str, arguments: dict[str, Any] = {}) -> CallToolR
         raise HTTPException(status_code=404, detail=f"Tool '{tool_name}' not found")
 
     return await client.call_tool(tool_name, arguments)
+
+
+async def _batch_call(index: int, item: Any) -> ToolBatchResult:
+    try:
+        if isinstance(item, bytes):
+            call = ToolBatchCall.model_validate_json(item)
+        else:
+            call = ToolBatchCall.model_validate(item)
+    except ValidationError as e:
+        return ToolBatchResult(index=index, error=f"Invalid call: {e.errors()[0]['msg']}")
+
+    client = await ClientManager.get_client_from_tool(call.tool)
+    if not client:
+        return ToolBatchResult(
+            index=index, tool=call.tool, error=f"Tool '{call.tool}' not found"
+        )
+
+    try:
+        result = await client.call_tool(call.tool, call.arguments)
+    except Exception as e:
+        logger.error(f"batch call to {call.tool} failed: {e}")
+        return ToolBatchResult(index=index, tool=call.tool, error=str(e) or type(e).__name__)
+
+    return ToolBatchResult(index=index, tool=call.tool, result=result)
+
+
+async def _run_batch(calls: list[Any]) -> AsyncIterator[str]:
+    """Run the calls with bounded concurrency, yielding results as they finish"""
+
+    limit = config.tool_calls.max_parallel_batch
+    semaphore = asyncio.Semaphore(limit)
+    # bounded too, so a slow reader holds up new calls instead of piling up results
+    results: asyncio.Queue[ToolBatchResult | None] = asyncio.Queue(maxsize=limit)
+    running: set[asyncio.Task] = set()
+
+    async def run(index: int, item: Any) -> None:
+        try:
+            await results.put(await _batch_call(index, item))
+        finally:
+            semaphore.release()
+
+    async def start_calls() -> None:
+        for index, item in enumerate(calls):
+            await semaphore.acquire()
+            task = asyncio.create_task(run(index, item))
+            running.add(task)
+            task.add_done_callback(running.discard)
+
+        await asyncio.gather(*list(running))
+        await results.put(None)
+
+    starter = asyncio.create_task(start_calls())
+    try:
+        while (result := await results.get()) is not None:
+            yield result.model_dump_json(by_alias=True, exclude_none=True) + "\n"
+    finally:
+        # the client went away, there is nobody left to send results to
+        starter.cancel()
+        for task in list(running):
+            task.cancel()
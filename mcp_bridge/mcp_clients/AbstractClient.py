@@ -1,8 +1,11 @@
 import asyncio
+import random
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from typing import Any, Callable, Literal, Optional
 from fastapi import HTTPException
-from mcp import McpError
+from mcp import McpError, types
 from mcp.types import (
     CallToolResult,
     ListToolsResult,
@@ -15,29 +18,197 @@ from mcp.types import (
 )
 from loguru import logger
 from pydantic import AnyUrl
+from mcp_bridge.config import config
+from mcp_bridge.config.final import Keepalive, Reconnect, SessionPool
+from mcp_bridge.health import UnhealthyEvent, manager as health_manager
 from mcp_bridge.mcp_clients.session import McpClientSession
+from mcp_bridge.mcp_clients.ToolResultCache import ToolResultCache, canonical_call_key
+from mcp_bridge.metrics import metrics
 from mcp_bridge.models.mcpServerStatus import McpServerStatus
 
+ClientEvent = Literal[
+    "connected", "disconnected", "tools_changed", "prompts_changed", "resources_changed"
+]
+ClientListener = Callable[["GenericMcpClient", ClientEvent], None]
+
+
+def backoff_delay(failures: int, settings: Reconnect) -> float:
+    """Exponential backoff with jitter for the given number of consecutive failures"""
+    delay = settings.initial_delay * settings.multiplier ** max(failures - 1, 0)
+    delay = min(delay, settings.max_delay)
+    return delay * (1 - settings.jitter * random.random())
+
 
 class GenericMcpClient(ABC):
     name: str
     config: Any
     client: Any
     session: McpClientSession | None = None
+    sessions: list[McpClientSession]
 
     def __init__(self, name: str) -> None:
         super().__init__()
         self.session = None
+        self.sessions = []
         self.name = name
+        self._workers: list[asyncio.Task] = []
+        self._session_load: dict[McpClientSession, int] = {}
+        self._session_last_used: dict[McpClientSession, float] = {}
+        self._queued_calls = 0
+        self._session_ready = asyncio.Event()
+        self._crash_looping = False
+        self.sleeping = False
+        self._woken_at: float | None = None
+        self._last_used = time.monotonic()
+        self._idle_reaper_task: asyncio.Task | None = None
+        self._listeners: list[ClientListener] = []
+        self._call_semaphore: asyncio.Semaphore | None = None
+        self._tool_caches: dict[str, ToolResultCache | None] = {}
+        self._server_cache: ToolResultCache | None = None
+        self._in_flight_calls: dict[str, asyncio.Future[CallToolResult]] = {}
+        self._call_waiters: dict[asyncio.Future[CallToolResult], int] = {}
 
         logger.debug(f"initializing client class for {name}")
 
     @abstractmethod
-    async def _maintain_session(self):
+    def _connect(self) -> AbstractAsyncContextManager[tuple[Any, Any]]:
+        """Open the read and write streams to the server"""
         pass
 
+    async def _maintain_session(self):
+        async with self._connect() as client:
+            async with McpClientSession(
+                *client, notification_callback=self._handle_notification
+            ) as session:
+                await session.initialize()
+                logger.debug(f"finished initialise session for {self.name}")
+                self._add_session(session)
+
+                try:
+                    await self._keep_alive(session)
+
+                except Exception as exc:
+                    logger.error(f"ping failed for {self.name}: {exc}")
+
+                finally:
+                    self._remove_session(session)
+
+        logger.debug(f"exiting session for {self.name}")
+
+    async def _keep_alive(self, session: McpClientSession) -> None:
+        """Ping the session until it fails or the pool retires it"""
+        settings: Keepalive = getattr(self.config, "keepalive", None) or Keepalive()
+        connected_at = time.monotonic()
+        failures = 0
+
+        while True:
+            await asyncio.sleep(settings.failure_interval if failures else settings.interval)
+            if time.monotonic() - connected_at >= config.reconnect.stable_after:
+                self._clear_crash_loop()
+
+            if self._should_retire(session):
+                logger.debug(f"stopping idle pooled session for {self.name}")
+                return
+
+            # a recent response already shows the session is alive
+            if not failures and time.monotonic() - session.last_response_at < settings.interval:
+                continue
+
+            if config.logging.log_server_pings:
+                logger.debug(f"pinging session for {self.name}")
+
+            started = time.monotonic()
+            try:
+                async with asyncio.timeout(settings.timeout):
+                    await session.send_ping()
+
+            except Exception as exc:
+                failures += 1
+                metrics.increment("ping_failures", server=self.name)
+                if failures >= settings.max_failures:
+                    raise
+
+                logger.warning(f"ping {failures}/{settings.max_failures} failed for {self.name}: {exc!r}")
+                continue
+
+            failures = 0
+            metrics.observe("ping_rtt_seconds", time.monotonic() - started, server=self.name)
+
+    def add_listener(self, listener: ClientListener) -> None:
+        """Register a callback for session lifecycle and list_changed events"""
+        self._listeners.append(listener)
+
+    def _emit(self, event: ClientEvent) -> None:
+        for listener in self._listeners:
+            try:
+                listener(self, event)
+            except Exception as e:
+                logger.error(f"listener failed for {self.name} on {event}: {e}")
+
+    def _add_session(self, session: McpClientSession) -> None:
+        """Put a ready session in the pool, the first one becomes the primary session"""
+        self.sessions.append(session)
+        self._session_load[session] = 0
+        self._session_last_used[session] = time.monotonic()
+
+        if self.session is None:
+            self.session = session
+            self._woken_at = None
+            self._session_ready.set()
+            self._emit("connected")
+
+    def _remove_session(self, session: McpClientSession) -> None:
+        if session not in self._session_load:
+            return
+
+        self.sessions.remove(session)
+        del self._session_load[session]
+        del self._session_last_used[session]
+
+        if self.session is not session:
+            return
+
+        # hand over to another pooled session if there is one
+        self.session = self.sessions[0] if self.sessions else None
+        if self.session is None:
+            self._session_ready.clear()
+            self._emit("disconnected")
+
+    def _handle_notification(self, notification: types.ServerNotification) -> None:
+        if isinstance(notification.root, types.ToolListChangedNotification):
+            logger.debug(f"tool list changed for {self.name}")
+            self._emit("tools_changed")
+
+        elif isinstance(notification.root, types.PromptListChangedNotification):
+            logger.debug(f"prompt list changed for {self.name}")
+            self._emit("prompts_changed")
+
+        elif isinstance(notification.root, types.ResourceListChangedNotification):
+            logger.debug(f"resource list changed for {self.name}")
+            self._emit("resources_changed")
+
+    def _report_crash_loop(self, failures: int) -> None:
+        if self._crash_looping:
+            return
+
+        logger.error(f"session for {self.name} is crash looping after {failures} failed restarts")
+        self._crash_looping = True
+        health_manager.add_unhealthy_event(
+            UnhealthyEvent(name=f"mcp_server:{self.name}", severity="error")
+        )
+
+    def _clear_crash_loop(self) -> None:
+        if not self._crash_looping:
+            return
+
+        logger.info(f"session for {self.name} is stable again")
+        self._crash_looping = False
+        health_manager.remove_unhealthy_events(f"mcp_server:{self.name}")
+
     async def _session_maintainer(self):
+        failures = 0
         while True:
+            started = time.monotonic()
             try:
                 await self._maintain_session()
             except FileNotFoundError as e:
@@ -45,26 +216,294 @@ class GenericMcpClient(ABC):
             except Exception as e:
                 logger.error(f"failed to maintain session for {self.name}: {type(e)} {e.args}")
 
-            logger.debug(f"restarting session for {self.name}")
-            await asyncio.sleep(0.5)
+            # retired workers are taken out of the pool and must not restart
+            if asyncio.current_task() not in self._workers:
+                return
+
+            # a session that stayed up for a while starts over with a short delay
+            if time.monotonic() - started >= config.reconnect.stable_after:
+                failures = 0
+
+            failures += 1
+            metrics.increment("session_restarts", server=self.name)
+            if failures >= config.reconnect.crash_loop_threshold:
+                self._report_crash_loop(failures)
+
+            delay = backoff_delay(failures, config.reconnect)
+            logger.debug(f"restarting session for {self.name} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    @property
+    def scales_to_zero(self) -> bool:
+        """Whether the server is stopped while unused and started on demand"""
+        return (
+            getattr(self.config, "lifecycle", "eager") == "lazy"
+            or getattr(self.config, "idle_timeout", None) is not None
+        )
 
     async def start(self):
-        asyncio.create_task(self._session_maintainer())
+        for _ in range(max(self._pool_limits().min, 1)):
+            self._spawn_worker()
+
+        idle_timeout = getattr(self.config, "idle_timeout", None)
+        if idle_timeout is not None and self._idle_reaper_task is None:
+            self._idle_reaper_task = asyncio.create_task(self._idle_reaper(idle_timeout))
+
+    async def stop(self) -> None:
+        """Stop every session, the client starts again on its next use"""
+        if self.sleeping:
+            return
+
+        logger.info(f"stopping sessions for {self.name}")
+        self.sleeping = True
+        self._woken_at = None
+
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+
+        await asyncio.gather(*workers, return_exceptions=True)
+        metrics.set_gauge("session_pool_size", 0, server=self.name)
+
+    def _wake(self) -> None:
+        logger.info(f"starting {self.name} on demand")
+        self.sleeping = False
+        self._woken_at = time.monotonic()
+        for _ in range(max(self._pool_limits().min, 1)):
+            self._spawn_worker()
+
+    async def _idle_reaper(self, idle_timeout: float) -> None:
+        while True:
+            await asyncio.sleep(min(idle_timeout, 10))
+            if self.sleeping or self._queued_calls > 0:
+                continue
+
+            if time.monotonic() - self._last_used >= idle_timeout:
+                await self.stop()
+
+    def _pool_limits(self) -> SessionPool:
+        pool = getattr(self.config, "pool_size", None)
+        return pool if pool is not None else SessionPool()
+
+    def _spawn_worker(self) -> None:
+        self._workers.append(asyncio.create_task(self._session_maintainer()))
+        metrics.set_gauge("session_pool_size", len(self._workers), server=self.name)
+
+    def _maybe_scale_up(self) -> None:
+        """Start another session when the calls queued per session get too deep"""
+        pool = self._pool_limits()
+        if len(self._workers) >= pool.max:
+            return
+
+        # sessions that are still starting count towards the capacity, so a
+        # burst of calls does not spawn the whole pool at once
+        depth = self._queued_calls / max(len(self._workers), 1)
+        if depth < pool.scale_up_queue_depth:
+            return
+
+        logger.info(f"scaling session pool for {self.name} to {len(self._workers) + 1}")
+        self._spawn_worker()
+
+    def _should_retire(self, session: McpClientSession) -> bool:
+        """Idle sessions above the pool minimum are stopped"""
+        if len(self._workers) <= max(self._pool_limits().min, 1):
+            return False
+
+        if self._session_load.get(session, 0) > 0:
+            return False
+
+        idle = time.monotonic() - self._session_last_used.get(session, 0)
+        if idle < self._pool_limits().idle_timeout:
+            return False
+
+        worker = asyncio.current_task()
+        if worker not in self._workers:
+            return False
+
+        self._workers.remove(worker)
+        metrics.set_gauge("session_pool_size", len(self._workers), server=self.name)
+        return True
+
+    async def _acquire_session(self) -> McpClientSession:
+        """Least busy session of the pool"""
+        # the pool can empty again while we wait, when a worker crashes or the
+        # idle reaper stops the client, so check after every wake up.
+        # _wait_for_session raises once its timeout passes
+        while not self.sessions:
+            await self._wait_for_session()
+
+        session = min(self.sessions, key=lambda s: self._session_load[s])
+        self._session_load[session] += 1
+        self._session_last_used[session] = time.monotonic()
+        return session
+
+    def _release_session(self, session: McpClientSession) -> None:
+        self._last_used = time.monotonic()
+
+        # the session may have left the pool while the call was running
+        if session in self._session_load:
+            self._session_load[session] -= 1
+            self._session_last_used[session] = time.monotonic()
+
+    def _get_call_semaphore(self) -> asyncio.Semaphore:
+        """Limits the concurrent tool calls sent to this server"""
+        if self._call_semaphore is None:
+            limit = getattr(self.config, "max_parallel_calls", None)
+            if limit is None:
+                limit = config.tool_calls.max_parallel_per_server
+
+            self._call_semaphore = asyncio.Semaphore(limit)
+
+        return self._call_semaphore
+
+    def _get_tool_cache(self, tool: str) -> ToolResultCache | None:
+        """Result cache for a tool, tool options take precedence over the server's"""
+        if tool in self._tool_caches:
+            return self._tool_caches[tool]
+
+        tool_options = getattr(self.config, "tools", {}).get(tool)
+        server_cache = getattr(self.config, "cache", None)
+
+        cache: ToolResultCache | None = None
+        if tool_options is not None and tool_options.cache is not None:
+            if tool_options.cache.enabled:
+                cache = ToolResultCache(f"{self.name}/{tool}", tool_options.cache)
+        elif server_cache is not None and server_cache.enabled:
+            # every tool of the server shares one cache
+            if self._server_cache is None:
+                self._server_cache = ToolResultCache(self.name, server_cache)
+            cache = self._server_cache
+
+        self._tool_caches[tool] = cache
+        return cache
+
+    def tool_timeout(self, tool: str) -> float | None:
+        """Timeout of a tool call, tool options take precedence over the server's"""
+        tool_options = getattr(self.config, "tools", {}).get(tool)
+        if tool_options is not None and tool_options.timeout is not None:
+            return tool_options.timeout
+
+        server_timeout = getattr(self.config, "tool_timeout", None)
+        if server_timeout is not None:
+            return server_timeout
+
+        return config.timeouts.tool_call
+
+    def start_timeout(self) -> float:
+        """Seconds a stopped server may take to start"""
+        return getattr(
+            self.config, "start_timeout", getattr(self.config, "session_wait_timeout", 5)
+        )
+
+    def request_timeout(self) -> float | None:
+        """Timeout for everything other than tool calls"""
+        server_timeout = getattr(self.config, "request_timeout", None)
+        if server_timeout is not None:
+            return server_timeout
+
+        return config.timeouts.request
+
+    @asynccontextmanager
+    async def _request_deadline(self, method: str):
+        try:
+            async with asyncio.timeout(self.request_timeout()):
+                yield
+
+        except TimeoutError:
+            metrics.increment("request_timeouts", server=self.name, method=method)
+            raise TimeoutError(f"{method} timed out on {self.name}") from None
+
+    def _should_coalesce(self, tool: str) -> bool:
+        tool_options = getattr(self.config, "tools", {}).get(tool)
+        if tool_options is not None and tool_options.coalesce is not None:
+            return tool_options.coalesce
+
+        return getattr(self.config, "coalesce", False)
 
     async def call_tool(
-        self, name: str, arguments: dict, timeout: Optional[int] = None
+        self, name: str, arguments: dict, timeout: Optional[float] = None
+    ) -> CallToolResult:
+        if timeout is None:
+            timeout = self.tool_timeout(name)
+
+        cache = self._get_tool_cache(name)
+
+        # cached tools are idempotent, so they are always safe to coalesce
+        coalesce = cache is not None or self._should_coalesce(name)
+        if not coalesce:
+            return await self._send_tool_call(name, arguments, timeout)
+
+        key = canonical_call_key(name, arguments)
+        if cache is not None:
+            result = cache.get(key)
+            if result is not None:
+                metrics.increment("tool_cache_hits", server=self.name, tool=name)
+                return result
+
+            metrics.increment("tool_cache_misses", server=self.name, tool=name)
+
+        result = await self._coalesced_tool_call(key, name, arguments, timeout)
+        if cache is not None:
+            cache.put(key, result)
+
+        return result
+
+    async def _coalesced_tool_call(
+        self, key: str, name: str, arguments: dict, timeout: Optional[float] = None
+    ) -> CallToolResult:
+        """Identical concurrent calls share a single tools/call request"""
+
+        call = self._in_flight_calls.get(key)
+        if call is not None:
+            metrics.increment("tool_calls_coalesced", server=self.name, tool=name)
+        else:
+            call = asyncio.ensure_future(self._send_tool_call(name, arguments, timeout))
+            self._in_flight_calls[key] = call
+
+            def done(_: asyncio.Future) -> None:
+                if self._in_flight_calls.get(key) is call:
+                    del self._in_flight_calls[key]
+
+            call.add_done_callback(done)
+
+        # one caller going away must not cancel the call for the others, but
+        # once every caller is gone nobody needs the result anymore
+        self._call_waiters[call] = self._call_waiters.get(call, 0) + 1
+        try:
+            return await asyncio.shield(call)
+
+        except asyncio.CancelledError:
+            if self._call_waiters[call] == 1 and not call.done():
+                call.cancel()
+            raise
+
+        finally:
+            self._call_waiters[call] -= 1
+            if self._call_waiters[call] == 0:
+                del self._call_waiters[call]
+
+    async def _send_tool_call(
+        self, name: str, arguments: dict, timeout: Optional[float] = None
     ) -> CallToolResult:
         await self._wait_for_session()
 
+        self._queued_calls += 1
+        self._maybe_scale_up()
+
         try:
-            async with asyncio.timeout(timeout):
-                return await self.session.call_tool(
-                    name=name,
-                    arguments=arguments,
-                )
+            async with self._get_call_semaphore(), asyncio.timeout(timeout):
+                session = await self._acquire_session()
+                try:
+                    return await session.call_tool(
+                        name=name,
+                        arguments=arguments,
+                    )
+                finally:
+                    self._release_session(session)
 
         except asyncio.TimeoutError:
             logger.error(f"timed out calling tool: {name}")
+            metrics.increment("tool_call_timeouts", server=self.name, tool=name)
             return CallToolResult(
                 content=[
                     TextContent(type="text", text=f"Timeout Error calling {name}")
@@ -79,13 +518,23 @@ class GenericMcpClient(ABC):
                 isError=True,
             )
 
+        except asyncio.CancelledError:
+            # the session tells the server to stop working on the request
+            logger.debug(f"call to {name} was cancelled")
+            metrics.increment("tool_calls_cancelled", server=self.name, tool=name)
+            raise
+
+        finally:
+            self._queued_calls -= 1
+
     async def get_prompt(
         self, prompt: str, arguments: dict[str, str]
     ) -> GetPromptResult | None:
         await self._wait_for_session()
 
         try:
-            return await self.session.get_prompt(prompt, arguments)
+            async with self._request_deadline("prompts/get"):
+                return await self.session.get_prompt(prompt, arguments)
         except Exception as e:
             logger.error(f"error evaluating prompt: {e}")
 
@@ -96,7 +545,8 @@ class GenericMcpClient(ABC):
     ) -> list[TextResourceContents | BlobResourceContents]:
         await self._wait_for_session()
         try:
-            resource = await self.session.read_resource(uri)
+            async with self._request_deadline("resources/read"):
+                resource = await self.session.read_resource(uri)
             return resource.contents
         except Exception as e:
             logger.error(f"error reading resource: {e}")
@@ -108,7 +558,8 @@ class GenericMcpClient(ABC):
         await self._wait_for_session()
 
         try:
-            return await self.session.list_tools()
+            async with self._request_deadline("tools/list"):
+                return await self.session.list_tools()
         except Exception as e:
             logger.error(f"error listing tools: {e}")
             return ListToolsResult(tools=[])
@@ -116,7 +567,8 @@ class GenericMcpClient(ABC):
     async def list_resources(self) -> ListResourcesResult:
         await self._wait_for_session()
         try:
-            return await self.session.list_resources()
+            async with self._request_deadline("resources/list"):
+                return await self.session.list_resources()
         except Exception as e:
             logger.error(f"error listing resources: {e}")
             return ListResourcesResult(resources=[])
@@ -124,17 +576,37 @@ class GenericMcpClient(ABC):
     async def list_prompts(self) -> ListPromptsResult:
         await self._wait_for_session()
         try:
-            return await self.session.list_prompts()
+            async with self._request_deadline("prompts/list"):
+                return await self.session.list_prompts()
         except Exception as e:
             logger.error(f"error listing prompts: {e}")
             return ListPromptsResult(prompts=[])
 
-    async def _wait_for_session(self, timeout: int = 5, http_error: bool = True):
+    async def _wait_for_session(
+        self, timeout: float | None = None, http_error: bool = True
+    ):
+        self._last_used = time.monotonic()
+        if self.session is not None:
+            return
+
+        if self.sleeping:
+            self._wake()
+
+        if timeout is None:
+            timeout = getattr(self.config, "session_wait_timeout", 5)
+
+            # a server woken from sleep starts from scratch, e.g. a new
+            # container, which takes longer than a reconnect
+            if self._woken_at is not None:
+                starting_for = time.monotonic() - self._woken_at
+                timeout = max(timeout, self.start_timeout() - starting_for)
+
+        logger.debug(f"waiting for session for {self.name}")
         try:
             async with asyncio.timeout(timeout):
+                # the event is set as soon as a session is ready
                 while self.session is None:
-                    await asyncio.sleep(1)
-                    logger.debug(f"waiting for session for {self.name}")
+                    await self._session_ready.wait()
 
         except asyncio.TimeoutError:
             if http_error:
@@ -146,6 +618,10 @@ class GenericMcpClient(ABC):
 
         assert self.session is not None, "Session is None"
 
+    async def wait_until_connected(self, timeout: float | None = None) -> None:
+        """Wait for a session, raises TimeoutError if there is none in time"""
+        await self._wait_for_session(timeout=timeout, http_error=False)
+
     async def status(self) -> McpServerStatus:
         """Get the status of the MCP server"""
         return McpServerStatus(
@@ -1,11 +1,20 @@
 import asyncio
+from contextlib import asynccontextmanager
 
-from mcp_bridge.mcp_clients.session import McpClientSession
-from mcp_bridge.config import config
-from mcpx.client.transports.docker import docker_client, DockerMCPServer
-from .AbstractClient import GenericMcpClient
+from aiodocker import Docker
+from aiodocker.containers import DockerContainer
 from loguru import logger
 
+from mcp_bridge.config.final import DockerMCPServer
+from .AbstractClient import GenericMcpClient
+from .dockerContainers import (
+    attach_container,
+    is_running,
+    pull_image,
+    remove_container,
+    start_container,
+)
+
 
 class DockerClient(GenericMcpClient):
     config: DockerMCPServer
@@ -14,25 +23,89 @@ class DockerClient(GenericMcpClient):
         super().__init__(name=name)
 
         self.config = config
+        self._docker: Docker | None = None
+        self._image_ready = False
+        self._image_lock = asyncio.Lock()
+        self._standby: list[DockerContainer] = []
+        self._refill_task: asyncio.Task | None = None
+
+    def _get_docker(self) -> Docker:
+        if self._docker is None:
+            self._docker = Docker()
+
+        return self._docker
+
+    async def start(self):
+        # pull the image and warm up standby containers while the sessions start
+        self._schedule_refill()
+        await super().start()
+
+    async def stop(self) -> None:
+        await super().stop()
+
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+            # a container being started is removed before docker is closed
+            await asyncio.gather(self._refill_task, return_exceptions=True)
+
+        standby, self._standby = self._standby, []
+        await asyncio.gather(*(remove_container(container) for container in standby))
+
+        if self._docker is not None:
+            await self._docker.close()
+            self._docker = None
+
+    async def _ensure_image(self) -> None:
+        """Pull the image once, instead of on every (re)connect"""
+        async with self._image_lock:
+            if not self._image_ready:
+                await pull_image(self._get_docker(), self.config.image)
+                self._image_ready = True
+
+    def _schedule_refill(self) -> None:
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.create_task(self._refill_standby())
+
+    async def _refill_standby(self) -> None:
+        try:
+            await self._ensure_image()
+            while len(self._standby) < self.config.warm_standby and not self.sleeping:
+                self._standby.append(await self._start_container())
+
+        except Exception as e:
+            logger.error(f"failed to prepare standby containers for {self.name}: {e}")
+
+    async def _take_container(self) -> DockerContainer:
+        """A warm standby container if there is one, otherwise a new one"""
+        while self._standby:
+            container = self._standby.pop(0)
+            if await is_running(container):
+                logger.debug(f"using standby container {container.id} for {self.name}")
+                return container
 
-    async def _maintain_session(self):
-        async with docker_client(self.config) as client:
-            logger.debug(f"made instance of docker client for {self.name}")
-            async with McpClientSession(*client) as session:
-                await session.initialize()
-                logger.debug(f"finished initialise session for {self.name}")
-                self.session = session
+            await remove_container(container)
 
-                try:
-                    while True:
-                        await asyncio.sleep(10)
-                        if config.logging.log_server_pings:
-                            logger.debug(f"pinging session for {self.name}")
+        await self._ensure_image()
+        return await self._start_container()
 
-                        await session.send_ping()
+    async def _start_container(self) -> DockerContainer:
+        """Start a container, which is removed again if we are cancelled meanwhile"""
+        starting = asyncio.ensure_future(start_container(self._get_docker(), self.config))
+        try:
+            return await asyncio.shield(starting)
+        except asyncio.CancelledError:
+            # the container would keep running with nobody knowing about it
+            try:
+                await remove_container(await starting)
+            except Exception as e:
+                logger.debug(f"container for {self.name} did not start: {e}")
+            raise
 
-                except Exception as exc:
-                    logger.error(f"ping failed for {self.name}: {exc}")
-                    self.session = None
+    @asynccontextmanager
+    async def _connect(self):
+        container = await self._take_container()
+        self._schedule_refill()
 
-        logger.debug(f"exiting session for {self.name}")
+        async with attach_container(container) as client:
+            logger.debug(f"attached to docker container for {self.name}")
+            yield client
@@ -1,53 +1,370 @@
-from typing import Union
+import asyncio
+import re
+import time
+from typing import Any, Awaitable, Callable, TypeVar, Union
 
 from loguru import logger
-from mcp import McpError, StdioServerParameters
-from mcpx.client.transports.docker import DockerMCPServer
+from mcp import Tool
+from mcp.types import (
+    ListPromptsResult,
+    ListResourcesResult,
+    ListToolsResult,
+    Prompt,
+    Resource,
+    ResourceTemplate,
+)
 
 from mcp_bridge.config import config
-from mcp_bridge.config.final import SSEMCPServer
+from mcp_bridge.config.final import (
+    DockerMCPServer,
+    SSEMCPServer,
+    StdioMCPServer,
+    StreamableHttpMCPServer,
+)
 
+from .AbstractClient import ClientEvent, GenericMcpClient
 from .DockerClient import DockerClient
 from .SseClient import SseClient
+from .StreamableHttpClient import StreamableHttpClient
 from .StdioClient import StdioClient
 
-client_types = Union[StdioClient, SseClient, DockerClient]
+client_types = Union[StdioClient, SseClient, StreamableHttpClient, DockerClient]
+
+T = TypeVar("T")
+
+
+def uri_template_pattern(template: str) -> re.Pattern[str]:
+    """Compile a RFC 6570 URI template into a regex matching its expansions"""
+
+    regex = ""
+    for part in re.split(r"(\{[^}]*\})", template):
+        if not (part.startswith("{") and part.endswith("}")):
+            regex += re.escape(part)
+            continue
+
+        operator = part[1:2]
+        if operator in ("+", "#"):
+            regex += ".*"
+        elif operator in ("?", "&"):
+            regex += r"(?:[?&].*)?"
+        elif operator in ("/", ".", ";"):
+            regex += f"(?:{re.escape(operator)}[^/?#]*)*"
+        else:
+            regex += "[^/?#]+"
+
+    return re.compile(regex)
 
 
 class MCPClientManager:
     clients: dict[str, client_types] = {}
 
+    # name/uri -> client, rebuilt from the per server snapshots below
+    _tool_index: dict[str, client_types] = {}
+    _prompt_index: dict[str, client_types] = {}
+    _resource_index: dict[str, client_types] = {}
+    _template_index: list[tuple[re.Pattern[str], client_types]] = []
+
+    _tools: dict[str, list[Tool]] = {}
+    _prompts: dict[str, list[Prompt]] = {}
+    _resources: dict[str, list[Resource]] = {}
+    _resource_templates: dict[str, list[ResourceTemplate]] = {}
+    _refresh_tasks: dict[str, set[asyncio.Task]] = {}
+    _prime_tasks: set[asyncio.Task] = set()
+
+    # bumped whenever the tool index changes so caches can tell they are stale
+    tools_version: int = 0
+    tools_refreshed_at: float = 0.0
+
     async def initialize(self):
         """Initialize the MCP Client Manager and start all clients"""
 
         logger.log("DEBUG", "Initializing MCP Client Manager")
 
         for server_name, server_config in config.mcp_servers.items():
-            self.clients[server_name] = await self.construct_client(
-                server_name, server_config
+            client = await self.construct_client(server_name, server_config)
+            client.add_listener(self._on_client_event)
+            self.clients[server_name] = client
+            await client.start()
+
+            if getattr(server_config, "lifecycle", "eager") == "lazy":
+                task = asyncio.create_task(self._prime_snapshot(client))
+                self._prime_tasks.add(task)
+                task.add_done_callback(self._prime_tasks.discard)
+
+    async def _prime_snapshot(self, client: GenericMcpClient) -> None:
+        """
+        Start a lazy server once at startup so its tools, prompts and resources
+        are in the catalog, then stop it until its first use
+        """
+
+        try:
+            await client.wait_until_connected(client.start_timeout())
+        except TimeoutError:
+            logger.warning(
+                f"lazy server {client.name} did not start within "
+                f"{client.start_timeout()}s, its entries are missing from the catalog"
             )
+            await client.stop()
+            return
+
+        # wait for the refreshes scheduled by the connected event
+        while tasks := self._refresh_tasks.get(client.name):
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        await client.stop()
+
+    async def shutdown(self):
+        """Stop every client, so no processes or containers are left behind"""
+
+        await asyncio.gather(*(client.stop() for client in self.clients.values()))
 
     async def construct_client(self, name, server_config) -> client_types:
         logger.log("DEBUG", f"Constructing client for {server_config}")
 
-        if isinstance(server_config, StdioServerParameters):
-            client = StdioClient(name, server_config)
-            await client.start()
-            return client
+        if isinstance(server_config, StdioMCPServer):
+            return StdioClient(name, server_config)
 
         if isinstance(server_config, SSEMCPServer):
             # TODO: implement sse client
-            client = SseClient(name, server_config)  # type: ignore
-            await client.start()
-            return client
-        
+            return SseClient(name, server_config)  # type: ignore
+
+        if isinstance(server_config, StreamableHttpMCPServer):
+            return StreamableHttpClient(name, server_config)
+
         if isinstance(server_config, DockerMCPServer):
-            client = DockerClient(name, server_config)
-            await client.start()
-            return client
+            return DockerClient(name, server_config)
 
         raise NotImplementedError("Client Type not supported")
 
+    def _on_client_event(self, client: GenericMcpClient, event: ClientEvent) -> None:
+        if event == "disconnected":
+            # servers that stop while idle keep their last known snapshot,
+            # they are started again when one of their entries is used
+            if client.scales_to_zero:
+                return
+
+            # a disconnected client cannot serve anything
+            self._tools.pop(client.name, None)
+            self._prompts.pop(client.name, None)
+            self._resources.pop(client.name, None)
+            self._resource_templates.pop(client.name, None)
+            self._rebuild_tool_index()
+            self._rebuild_prompt_index()
+            self._rebuild_resource_index()
+            return
+
+        refreshes = {
+            "connected": [self.refresh_tools, self.refresh_prompts, self.refresh_resources],
+            "tools_changed": [self.refresh_tools],
+            "prompts_changed": [self.refresh_prompts],
+            "resources_changed": [self.refresh_resources],
+        }
+
+        # listeners are called from inside the session, so the refresh has to
+        # run as its own task to avoid blocking the session receive loop
+        tasks = self._refresh_tasks.setdefault(client.name, set())
+        for refresh in refreshes[event]:
+            task = asyncio.create_task(refresh(client))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+    async def _fetch(
+        self, client: GenericMcpClient, kind: str, fetch: Callable[[Any], Awaitable[T]]
+    ) -> T | None:
+        """List something from the client session, None if it went away"""
+
+        session = client.session
+        if session is None:
+            return None
+
+        try:
+            async with asyncio.timeout(client.request_timeout()):
+                result = await fetch(session)
+        except Exception as e:
+            logger.error(f"failed to refresh {kind} for {client.name}: {e}")
+            return None
+
+        # the session was replaced while we were listing
+        if client.session is not session:
+            return None
+
+        return result
+
+    def _supports(self, client: GenericMcpClient, capability: str) -> bool:
+        """Whether the server advertised a capability, e.g. prompts or resources"""
+
+        session = client.session
+        if session is None or session.server_capabilities is None:
+            return True
+
+        return getattr(session.server_capabilities, capability) is not None
+
+    async def refresh_tools(self, client: GenericMcpClient) -> None:
+        """Re-list the tools of a client and update the tool index"""
+
+        list_tools = await self._fetch(client, "tools", lambda s: s.list_tools())
+        if list_tools is None:
+            return
+
+        self._tools[client.name] = list_tools.tools
+        self._rebuild_tool_index()
+        logger.debug(f"indexed {len(list_tools.tools)} tools for {client.name}")
+
+    async def refresh_prompts(self, client: GenericMcpClient) -> None:
+        """Re-list the prompts of a client and update the prompt index"""
+
+        # servers without prompts answer the list with method not found
+        if not self._supports(client, "prompts"):
+            return
+
+        list_prompts = await self._fetch(client, "prompts", lambda s: s.list_prompts())
+        if list_prompts is None:
+            return
+
+        self._prompts[client.name] = list_prompts.prompts
+        self._rebuild_prompt_index()
+        logger.debug(f"indexed {len(list_prompts.prompts)} prompts for {client.name}")
+
+    async def refresh_resources(self, client: GenericMcpClient) -> None:
+        """Re-list the resources and resource templates of a client"""
+
+        if not self._supports(client, "resources"):
+            return
+
+        list_resources = await self._fetch(
+            client, "resources", lambda s: s.list_resources()
+        )
+        list_templates = await self._fetch(
+            client, "resource templates", lambda s: s.list_resource_templates()
+        )
+        if list_resources is None and list_templates is None:
+            return
+
+        if list_resources is not None:
+            self._resources[client.name] = list_resources.resources
+        if list_templates is not None:
+            self._resource_templates[client.name] = list_templates.resourceTemplates
+
+        self._rebuild_resource_index()
+        logger.debug(f"indexed resources for {client.name}")
+
+    async def refresh_all_tools(self) -> None:
+        """Re-list the tools of every connected client"""
+
+        self.tools_refreshed_at = time.monotonic()
+        await asyncio.gather(
+            *(self.refresh_tools(client) for client in self.clients.values())
+        )
+
+    def _rebuild_tool_index(self) -> None:
+        # iterate in config order so the first server to define a tool wins
+        index: dict[str, client_types] = {}
+        for name, client in self.clients.items():
+            for tool in self._tools.get(name, []):
+                index.setdefault(tool.name, client)
+
+        self._tool_index = index
+        self.tools_version += 1
+        self.tools_refreshed_at = time.monotonic()
+
+    def _rebuild_prompt_index(self) -> None:
+        index: dict[str, client_types] = {}
+        for name, client in self.clients.items():
+            for prompt in self._prompts.get(name, []):
+                index.setdefault(prompt.name, client)
+
+        self._prompt_index = index
+
+    def _rebuild_resource_index(self) -> None:
+        index: dict[str, client_types] = {}
+        templates: list[tuple[re.Pattern[str], client_types]] = []
+        for name, client in self.clients.items():
+            for resource in self._resources.get(name, []):
+                index.setdefault(str(resource.uri), client)
+
+            for template in self._resource_templates.get(name, []):
+                templates.append((uri_template_pattern(template.uriTemplate), client))
+
+        self._resource_index = index
+        self._template_index = templates
+
+    def get_resource_templates(self) -> list[ResourceTemplate]:
+        """Get the indexed resource templates of every server"""
+        return [
+            template
+            for name in self.clients
+            for template in self._resource_templates.get(name, [])
+        ]
+
+    def tools_snapshot(self, name: str) -> ListToolsResult | None:
+        """Last known tools of a server"""
+        if name not in self._tools:
+            return None
+        return ListToolsResult(tools=self._tools[name])
+
+    def prompts_snapshot(self, name: str) -> ListPromptsResult | None:
+        """Last known prompts of a server"""
+        if name not in self._prompts:
+            return None
+        return ListPromptsResult(prompts=self._prompts[name])
+
+    def resources_snapshot(self, name: str) -> ListResourcesResult | None:
+        """Last known resources of a server"""
+        if name not in self._resources:
+            return None
+        return ListResourcesResult(resources=self._resources[name])
+
+    def get_tools(self) -> list[Tool]:
+        """Get the indexed tools, without duplicate names"""
+        tools: dict[str, Tool] = {}
+        for name in self.clients:
+            for tool in self._tools.get(name, []):
+                tools.setdefault(tool.name, tool)
+
+        return list(tools.values())
+
+    async def fan_out(
+        self,
+        method: Callable[[client_types], Awaitable[T]],
+        snapshot: Callable[[str], T | None] | None = None,
+    ) -> tuple[dict[str, T], list[str]]:
+        """
+        Run `method` against every client concurrently, each bounded by the
+        fan out deadline. Returns the results by server name, in config
+        order, and the names of the servers that were omitted.
+
+        Stopped servers are answered from `snapshot` instead of being started.
+        """
+
+        results: dict[str, T] = {}
+        omitted: set[str] = set()
+
+        async def run(name: str, client: client_types) -> None:
+            if client.sleeping and snapshot is not None:
+                result = snapshot(name)
+                if result is not None:
+                    results[name] = result
+                    return
+
+            if config.fan_out.skip_offline and client.session is None:
+                omitted.add(name)
+                return
+
+            try:
+                async with asyncio.timeout(config.fan_out.timeout):
+                    results[name] = await method(client)
+            except TimeoutError:
+                logger.warning(f"{name} did not respond within the fan out deadline")
+                omitted.add(name)
+            except Exception as e:
+                logger.error(f"fan out to {name} failed: {e}")
+                omitted.add(name)
+
+        await asyncio.gather(*(run(name, client) for name, client in self.get_clients()))
+
+        ordered = {name: results[name] for name in self.clients if name in results}
+        return ordered, [name for name in self.clients if name in omitted]
+
     def get_client(self, server_name: str):
         return self.clients[server_name]
 
@@ -55,34 +372,21 @@ class MCPClientManager:
         return list(self.clients.items())
 
     async def get_client_from_tool(self, tool: str):
-        for name, client in self.get_clients():
-            
-            # client cannot have tools if it is not connected
-            if not client.session:
-                continue
-
-            try:
-                list_tools = await client.session.list_tools()
-                for client_tool in list_tools.tools:
-                    if client_tool.name == tool:
-                        return client
-            except McpError:
-                continue
+        return self._tool_index.get(tool)
 
     async def get_client_from_prompt(self, prompt: str):
-        for name, client in self.get_clients():
+        return self._prompt_index.get(prompt)
+
+    async def get_client_from_resource(self, uri: str):
+        client = self._resource_index.get(uri)
+        if client is not None:
+            return client
 
-            # client cannot have prompts if it is not connected
-            if not client.session:
-                continue
+        for pattern, client in self._template_index:
+            if pattern.fullmatch(uri):
+                return client
 
-            try:
-                list_prompts = await client.session.list_prompts()
-                for client_prompt in list_prompts.prompts:
-                    if client_prompt.name == prompt:
-                        return client
-            except McpError:
-                continue
+        return None
 
 
 ClientManager = MCPClientManager()
@@ -1,8 +1,7 @@
-import asyncio
-from mcp import StdioServerParameters, stdio_client
+from contextlib import asynccontextmanager
+from mcp import stdio_client
 
-from mcp_bridge.config import config
-from mcp_bridge.mcp_clients.session import McpClientSession
+from mcp_bridge.config.final import StdioMCPServer
 from .AbstractClient import GenericMcpClient
 from loguru import logger
 import shutil
@@ -13,9 +12,9 @@ import os
 venv_keywords = ["CONDA", "VIRTUAL", "PYTHON"]
 
 class StdioClient(GenericMcpClient):
-    config: StdioServerParameters
+    config: StdioMCPServer
 
-    def __init__(self, name: str, config: StdioServerParameters) -> None:
+    def __init__(self, name: str, config: StdioMCPServer) -> None:
         super().__init__(name=name)
 
         # logger.debug(f"initializing settings for {name}: {config.command} {" ".join(config.args)}")
@@ -47,28 +46,11 @@ class StdioClient(GenericMcpClient):
 
         self.config = own_config
 
-    async def _maintain_session(self):
+    @asynccontextmanager
+    async def _connect(self):
         logger.debug(f"starting maintain session for {self.name}")
         async with stdio_client(self.config) as client:
             logger.debug(f"entered stdio_client context manager for {self.name}")
             assert client[0] is not None, f"missing read stream for {self.name}"
             assert client[1] is not None, f"missing write stream for {self.name}"
-            async with McpClientSession(*client) as session:
-                logger.debug(f"entered client session context manager for {self.name}")
-                await session.initialize()
-                logger.debug(f"finished initialise session for {self.name}")
-                self.session = session
-
-                try:
-                    while True:
-                        await asyncio.sleep(10)
-                        if config.logging.log_server_pings:
-                            logger.debug(f"pinging session for {self.name}")
-
-                        await session.send_ping()
-
-                except Exception as exc:
-                    logger.error(f"ping failed for {self.name}: {exc}")
-                    self.session = None
-
-        logger.debug(f"exiting session for {self.name}")
+            yield client
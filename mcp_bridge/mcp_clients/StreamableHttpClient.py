@@ -0,0 +1,20 @@
+from mcp_bridge.config.final import StreamableHttpMCPServer
+from .AbstractClient import GenericMcpClient
+from .streamableHttp import streamable_http_client
+
+
+class StreamableHttpClient(GenericMcpClient):
+    config: StreamableHttpMCPServer
+
+    def __init__(self, name: str, config: StreamableHttpMCPServer) -> None:
+        super().__init__(name=name)
+
+        self.config = config
+
+    def _connect(self):
+        return streamable_http_client(
+            self.config.url,
+            headers=self.config.headers,
+            http2=self.config.http2,
+            timeout=self.config.timeout,
+        )
@@ -0,0 +1,80 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any
+
+from mcp.types import CallToolResult
+
+from mcp_bridge.config.final import ToolCache
+from mcp_bridge.metrics import metrics
+
+
+def canonical_call_key(name: str, arguments: dict[str, Any] | None) -> str:
+    """Key for a tool call that does not depend on the argument order"""
+    return json.dumps(
+        [name, arguments or {}],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+
+
+class ToolResultCache:
+    """TTL and LRU bounded cache of successful tool call results"""
+
+    def __init__(self, name: str, settings: ToolCache) -> None:
+        self.name = name
+        self.settings = settings
+        self.size = 0
+
+        # key -> (expires at, size in bytes, result), oldest used first
+        self._entries: OrderedDict[str, tuple[float, int, CallToolResult]] = (
+            OrderedDict()
+        )
+
+    def get(self, key: str) -> CallToolResult | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, _, result = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return result
+
+    def put(self, key: str, result: CallToolResult) -> None:
+        # errors are usually transient, so they are never cached
+        if result.isError:
+            return
+
+        size = len(result.model_dump_json())
+        if size > self.settings.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (time.monotonic() + self.settings.ttl, size, result)
+        self.size += size
+
+        while (
+            len(self._entries) > self.settings.max_entries
+            or self.size > self.settings.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+            metrics.increment("tool_cache_evictions", cache=self.name)
+
+        self._report()
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.size -= size
+        self._report()
+
+    def _report(self) -> None:
+        metrics.set_gauge("tool_cache_entries", len(self._entries), cache=self.name)
+        metrics.set_gauge("tool_cache_bytes", self.size, cache=self.name)
@@ -0,0 +1,146 @@
+from contextlib import asynccontextmanager
+
+import anyio
+import anyio.lowlevel
+from aiodocker import Docker
+from aiodocker.containers import DockerContainer
+from aiodocker.exceptions import DockerError
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from loguru import logger
+from mcp import types
+from mcpx.client.transports.docker import DockerMCPServer
+
+__all__ = [
+    "pull_image",
+    "start_container",
+    "remove_container",
+    "is_running",
+    "attach_container",
+]
+
+
+async def pull_image(docker: Docker, image: str) -> None:
+    """Pull the image, keeping a local copy usable if the registry is unreachable"""
+
+    try:
+        await docker.images.pull(image)
+        logger.debug(f"pulled docker image {image}")
+    except DockerError as e:
+        try:
+            await docker.images.inspect(image)
+        except DockerError:
+            raise e
+
+        logger.warning(f"failed to pull {image}, using the local image: {e}")
+
+
+async def start_container(docker: Docker, server: DockerMCPServer) -> DockerContainer:
+    # same container spec as the mcpx docker transport
+    container = await docker.containers.create(
+        {
+            "Image": server.image,
+            "Args": server.args,
+            "OpenStdin": True,
+            "AttachStdout": True,
+            "AttachStderr": True,
+            "Tty": False,
+            "HostConfig": {"AutoRemove": True},
+        }
+    )
+
+    try:
+        await container.start()
+    except BaseException:
+        # auto remove only applies to containers that were started
+        try:
+            await container.delete(force=True)
+        except DockerError as e:
+            logger.error(f"failed to remove docker container {container.id}: {e}")
+        raise
+
+    logger.debug(f"started docker container {container.id}")
+    return container
+
+
+async def remove_container(container: DockerContainer) -> None:
+    """Stop the container, auto remove deletes it once it has stopped"""
+
+    try:
+        await container.stop()
+    except DockerError as e:
+        # 304: already stopped, 404: already removed
+        if e.status not in (304, 404):
+            logger.error(f"failed to stop docker container {container.id}: {e}")
+
+
+async def is_running(container: DockerContainer) -> bool:
+    try:
+        info = await container.show()
+    except DockerError:
+        return False
+
+    return bool(info.get("State", {}).get("Running"))
+
+
+@asynccontextmanager
+async def attach_container(container: DockerContainer):
+    """
+    Client transport for a running container, communicating over its
+    stdin/stdout. The container is removed when the transport exits.
+    """
+
+    read_stream: MemoryObjectReceiveStream[types.JSONRPCMessage | Exception]
+    read_stream_writer: MemoryObjectSendStream[types.JSONRPCMessage | Exception]
+
+    write_stream: MemoryObjectSendStream[types.JSONRPCMessage]
+    write_stream_reader: MemoryObjectReceiveStream[types.JSONRPCMessage]
+
+    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+
+    attach_result = container.attach(stdout=True, stdin=True)
+
+    try:
+        async def read_from_stdout():
+            try:
+                async with read_stream_writer:
+                    buffer = ""
+                    while True:
+                        msg = await attach_result.read_out()
+                        # the container exited
+                        if msg is None:
+                            return
+
+                        lines = (buffer + msg.data.decode("utf-8")).split("\n")
+                        buffer = lines.pop()
+
+                        for line in lines:
+                            try:
+                                message = types.JSONRPCMessage.model_validate_json(line)
+                                await read_stream_writer.send(message)
+                            except Exception as exc:
+                                await read_stream_writer.send(exc)
+            except anyio.ClosedResourceError:
+                await anyio.lowlevel.checkpoint()
+
+        async def write_to_stdin():
+            try:
+                async with write_stream_reader:
+                    async for message in write_stream_reader:
+                        json = message.model_dump_json(by_alias=True, exclude_none=True)
+                        await attach_result.write_in(json.encode("utf-8") + b"\n")
+            except anyio.ClosedResourceError:
+                await anyio.lowlevel.checkpoint()
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(read_from_stdout)
+            tg.start_soon(write_to_stdin)
+            try:
+                yield read_stream, write_stream
+            finally:
+                tg.cancel_scope.cancel()
+
+    finally:
+        with anyio.CancelScope(shield=True):
+            await attach_result.close()
+            await remove_container(container)
@@ -1,19 +1,27 @@
+import time
 from datetime import timedelta
-from typing import Awaitable, Callable
+import anyio
+from typing import Awaitable, Callable, TypeVar
 
 from loguru import logger
+import httpx
 import mcp.types as types
 from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from mcp import McpError
 from mcp.shared.session import BaseSession, RequestResponder
 from mcp.shared.version import SUPPORTED_PROTOCOL_VERSIONS
 from pydantic import AnyUrl
 
 from mcp_bridge import __version__ as version
 from mcp_bridge.sampling.sampler import handle_sampling_message
+from .streamableHttp import is_local_error
 
 sampling_function_signature = Callable[
     [types.CreateMessageRequestParams], Awaitable[types.CreateMessageResult]
 ]
+notification_callback_signature = Callable[[types.ServerNotification], None]
+
+ResultT = TypeVar("ResultT")
 
 
 class McpClientSession(
@@ -31,6 +39,7 @@ class McpClientSession(
         read_stream: MemoryObjectReceiveStream[types.JSONRPCMessage | Exception],
         write_stream: MemoryObjectSendStream[types.JSONRPCMessage],
         read_timeout_seconds: timedelta | None = None,
+        notification_callback: notification_callback_signature | None = None,
     ) -> None:
         super().__init__(
             read_stream,
@@ -39,6 +48,41 @@ class McpClientSession(
             types.ServerNotification,
             read_timeout_seconds=read_timeout_seconds,
         )
+        self._notification_callback = notification_callback
+
+        # time of the last response from the server, used by the keepalive
+        self.last_response_at = time.monotonic()
+
+        # what the server advertised in its initialize result
+        self.server_capabilities: types.ServerCapabilities | None = None
+
+    async def send_request(
+        self,
+        request: types.ClientRequest,
+        result_type: type[ResultT],
+        request_read_timeout_seconds: timedelta | None = None,
+    ) -> ResultT:
+        # the base session takes the id of the request from this counter
+        request_id = self._request_id
+
+        try:
+            result = await super().send_request(
+                request, result_type, request_read_timeout_seconds
+            )
+        except McpError as e:
+            # an error response still shows the server is responsive, unless
+            # the transport made it up because the server could not be reached
+            if e.error.code != httpx.codes.REQUEST_TIMEOUT and not is_local_error(e.error):
+                self.last_response_at = time.monotonic()
+            raise
+        except anyio.get_cancelled_exc_class():
+            # initialize must not be cancelled according to the spec
+            if not isinstance(request.root, types.InitializeRequest):
+                await self._send_cancelled(request_id, "request was cancelled by the client")
+            raise
+
+        self.last_response_at = time.monotonic()
+        return result
 
     async def __aenter__(self):
         session = await super().__aenter__()
@@ -92,6 +136,8 @@ class McpClientSession(
                 f"{result.protocolVersion}"
             )
 
+        self.server_capabilities = result.capabilities
+
         await self.send_notification(
             types.ClientNotification(
                 types.InitializedNotification(method="notifications/initialized")
@@ -100,6 +146,26 @@ class McpClientSession(
 
         return result
 
+    async def _send_cancelled(self, request_id: types.RequestId, reason: str) -> None:
+        """Tell the server to stop working on a request we no longer wait for"""
+
+        # this runs while the caller is being cancelled, and a dead transport
+        # must not keep it from finishing
+        with anyio.move_on_after(1, shield=True):
+            try:
+                await self.send_notification(
+                    types.ClientNotification(
+                        types.CancelledNotification(
+                            method="notifications/cancelled",
+                            params=types.CancelledNotificationParams(
+                                requestId=request_id, reason=reason
+                            ),
+                        )
+                    )
+                )
+            except Exception as e:
+                logger.debug(f"failed to send cancellation for request {request_id}: {e}")
+
     async def send_ping(self) -> types.EmptyResult:
         """Send a ping request."""
         return await self.send_request(
@@ -151,6 +217,17 @@ class McpClientSession(
             types.ListResourcesResult,
         )
 
+    async def list_resource_templates(self) -> types.ListResourceTemplatesResult:
+        """Send a resources/templates/list request."""
+        return await self.send_request(
+            types.ClientRequest(
+                types.ListResourceTemplatesRequest(
+                    method="resources/templates/list",
+                )
+            ),
+            types.ListResourceTemplatesResult,
+        )
+
     async def read_resource(self, uri: AnyUrl) -> types.ReadResourceResult:
         """Send a resources/read request."""
         return await self.send_request(
@@ -264,6 +341,14 @@ class McpClientSession(
             )
         )
 
+    async def _received_notification(
+        self, notification: types.ServerNotification
+    ) -> None:
+        # this runs inside the receive loop, so the callback must not block on
+        # requests to this session
+        if self._notification_callback is not None:
+            self._notification_callback(notification)
+
     async def _received_request(
         self, responder: RequestResponder["types.ServerRequest", "types.ClientResult"]
     ) -> None:
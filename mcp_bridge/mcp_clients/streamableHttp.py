@@ -0,0 +1,266 @@
+import json
+from contextlib import asynccontextmanager
+
+import anyio
+import httpx
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from httpx_sse import EventSource
+from loguru import logger
+import mcp.types as types
+
+__all__ = [
+    "streamable_http_client",
+    "get_http_client",
+    "close_http_clients",
+    "is_local_error",
+]
+
+SESSION_ID_HEADER = "mcp-session-id"
+
+# marks errors made up by the transport, they are not answers from the server
+LOCAL_ERROR_DATA = {"origin": "mcp-bridge-transport"}
+
+# every streamable http server shares these clients, so connections to the
+# same host are kept alive and reused across servers and sessions
+_http_clients: dict[bool, httpx.AsyncClient] = {}
+
+
+def get_http_client(http2: bool = False) -> httpx.AsyncClient:
+    """Get the shared client, falling back to HTTP/1.1 if h2 is not installed"""
+
+    client = _http_clients.get(http2)
+    if client is not None:
+        return client
+
+    try:
+        client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=100, max_keepalive_connections=20, keepalive_expiry=30
+            ),
+        )
+    except ImportError:
+        logger.warning("http2 needs the h2 package (pip install httpx[http2]), using HTTP/1.1")
+        return get_http_client(http2=False)
+
+    _http_clients[http2] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    for client in _http_clients.values():
+        await client.aclose()
+
+    _http_clients.clear()
+
+
+def is_local_error(error: types.ErrorData) -> bool:
+    """Whether an error was made up by the transport instead of sent by the server"""
+    return error.data == LOCAL_ERROR_DATA
+
+
+def _local_error(request_id: types.RequestId, message: str) -> types.JSONRPCMessage:
+    return types.JSONRPCMessage(
+        types.JSONRPCError(
+            jsonrpc="2.0",
+            id=request_id,
+            error=types.ErrorData(
+                code=types.INTERNAL_ERROR, message=message, data=LOCAL_ERROR_DATA
+            ),
+        )
+    )
+
+
+def _is_fatal(exc: Exception, session_id: str | None) -> bool:
+    """Failures that end the session, rather than just the one message"""
+
+    if isinstance(exc, httpx.TransportError):
+        return True
+
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        # a 404 for a session id means the server has forgotten the session
+        return status >= 500 or (status == 404 and session_id is not None)
+
+    return False
+
+
+def _parse_messages(data: str | bytes) -> list[types.JSONRPCMessage]:
+    """Parse a JSON-RPC message or batch"""
+
+    payload = json.loads(data)
+    if isinstance(payload, list):
+        return [types.JSONRPCMessage.model_validate(item) for item in payload]
+
+    return [types.JSONRPCMessage.model_validate(payload)]
+
+
+@asynccontextmanager
+async def streamable_http_client(
+    url: str,
+    headers: dict[str, str] | None = None,
+    http2: bool = False,
+    timeout: float = 30,
+    sse_read_timeout: float = 60 * 5,
+):
+    """
+    Client transport for the Streamable HTTP transport of MCP.
+
+    Every message is POSTed on its own, the response is either plain JSON or
+    an SSE stream with the messages for that request. Server initiated
+    messages are received on an optional GET stream.
+    """
+
+    read_stream: MemoryObjectReceiveStream[types.JSONRPCMessage | Exception]
+    read_stream_writer: MemoryObjectSendStream[types.JSONRPCMessage | Exception]
+
+    write_stream: MemoryObjectSendStream[types.JSONRPCMessage]
+    write_stream_reader: MemoryObjectReceiveStream[types.JSONRPCMessage]
+
+    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+
+    client = get_http_client(http2)
+    base_headers = dict(headers or {})
+    session_id: str | None = None
+    listening = False
+    # requests still waiting for their response, answered locally if the
+    # transport fails so their callers do not wait for nothing
+    pending: set[types.RequestId] = set()
+
+    def request_headers(accept: str) -> dict[str, str]:
+        request_headers = {**base_headers, "Accept": accept}
+        if session_id is not None:
+            request_headers[SESSION_ID_HEADER] = session_id
+
+        return request_headers
+
+    async def forward(response: httpx.Response) -> None:
+        content_type = response.headers.get("content-type", "")
+
+        if content_type.startswith("text/event-stream"):
+            async for sse in EventSource(response).aiter_sse():
+                if sse.event == "message" and sse.data:
+                    for message in _parse_messages(sse.data):
+                        await receive(message)
+
+        elif content_type.startswith("application/json"):
+            for message in _parse_messages(await response.aread()):
+                await receive(message)
+
+    async def receive(message: types.JSONRPCMessage) -> None:
+        if isinstance(message.root, (types.JSONRPCResponse, types.JSONRPCError)):
+            pending.discard(message.root.id)
+
+        await read_stream_writer.send(message)
+
+    async def listen() -> None:
+        """Receive server initiated requests and notifications"""
+
+        try:
+            async with client.stream(
+                "GET",
+                url,
+                headers=request_headers("text/event-stream"),
+                timeout=httpx.Timeout(timeout, read=sse_read_timeout),
+            ) as response:
+                # servers are free to not offer this stream
+                if response.status_code == 405:
+                    return
+
+                response.raise_for_status()
+                await forward(response)
+
+        except Exception as exc:
+            logger.warning(f"server message stream for {url} closed: {exc}")
+
+    async def post(message: types.JSONRPCMessage) -> None:
+        nonlocal session_id, listening
+
+        if isinstance(message.root, types.JSONRPCRequest):
+            pending.add(message.root.id)
+
+        try:
+            async with client.stream(
+                "POST",
+                url,
+                content=message.model_dump_json(by_alias=True, exclude_none=True),
+                headers={
+                    **request_headers("application/json, text/event-stream"),
+                    "Content-Type": "application/json",
+                },
+                timeout=httpx.Timeout(timeout, read=sse_read_timeout),
+            ) as response:
+                response.raise_for_status()
+
+                if SESSION_ID_HEADER in response.headers:
+                    session_id = response.headers[SESSION_ID_HEADER]
+
+                if response.status_code == 202:
+                    return
+
+                await forward(response)
+
+        except Exception as exc:
+            logger.error(f"error posting to {url}: {exc}")
+
+            if not _is_fatal(exc, session_id):
+                # only this message failed, answer it ourselves so the session
+                # does not wait for a response that is never coming
+                if isinstance(message.root, types.JSONRPCRequest):
+                    pending.discard(message.root.id)
+                    await read_stream_writer.send(_local_error(message.root.id, str(exc)))
+
+                return
+
+            # the session is gone or unreachable, answer everything that is
+            # still waiting and end the transport, so the session is torn
+            # down and reconnected with backoff
+            if isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 404:
+                session_id = None
+
+            for request_id in list(pending):
+                await read_stream_writer.send(_local_error(request_id, str(exc)))
+            pending.clear()
+
+            raise RuntimeError(f"streamable http transport to {url} failed: {exc}") from exc
+
+        # the server can only push messages once the session is initialized
+        if (
+            not listening
+            and isinstance(message.root, types.JSONRPCNotification)
+            and message.root.method == "notifications/initialized"
+        ):
+            listening = True
+            tg.start_soon(listen)
+
+    async def post_writer() -> None:
+        try:
+            async with write_stream_reader:
+                async for message in write_stream_reader:
+                    # requests run concurrently, a slow tool call must not hold
+                    # up the messages after it
+                    tg.start_soon(post, message)
+        finally:
+            await write_stream.aclose()
+
+    async with anyio.create_task_group() as tg:
+        try:
+            tg.start_soon(post_writer)
+            try:
+                yield read_stream, write_stream
+            finally:
+                tg.cancel_scope.cancel()
+
+        finally:
+            await read_stream_writer.aclose()
+            await write_stream.aclose()
+
+            if session_id is not None:
+                with anyio.CancelScope(shield=True):
+                    try:
+                        await client.delete(
+                            url, headers=request_headers("application/json"), timeout=timeout
+                        )
+                    except Exception as exc:
+                        logger.debug(f"failed to terminate session on {url}: {exc}")
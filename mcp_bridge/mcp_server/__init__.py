@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends
 from .sse import router as sse_router
+from .streamable_http import router as streamable_http_router
 from mcp_bridge.openapi_tags import Tag
 from mcp_bridge.auth import get_api_key
 
@@ -7,3 +8,4 @@ __all__ = ["router"]
 
 router = APIRouter(prefix="/mcp-server", tags=[Tag.mcp_server])
 router.include_router(sse_router)
+router.include_router(streamable_http_router)
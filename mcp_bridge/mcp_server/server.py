@@ -9,50 +9,55 @@ __all__ = ["server", "options"]
 
 server = Server("MCP-Bridge")
 
+
+def log_omitted(kind: str, omitted: list[str]) -> None:
+    if omitted:
+        logger.warning(f"listing {kind} omitted servers: {', '.join(omitted)}")
+
+
 ## list functions
 
 
 @server.list_prompts()
 async def list_prompts() -> list[types.Prompt]:
-    prompts = []
-    for name, client in ClientManager.get_clients():
-        # if client is None, then we cannot list the prompts
-        if client is None:
-            logger.error(f"Client '{name}' not found")
-            continue
+    results, omitted = await ClientManager.fan_out(
+        lambda client: client.list_prompts(), ClientManager.prompts_snapshot
+    )
+    log_omitted("prompts", omitted)
 
-        client_prompts = await client.list_prompts()
+    prompts = []
+    for client_prompts in results.values():
         prompts.extend(client_prompts.prompts)
     return prompts
 
 
 @server.list_resources()
 async def list_resources() -> list[types.Resource]:
+    results, omitted = await ClientManager.fan_out(
+        lambda client: client.list_resources(), ClientManager.resources_snapshot
+    )
+    log_omitted("resources", omitted)
+
     resources = []
-    for name, client in ClientManager.get_clients():
-        try:
-            client_resources = await client.list_resources()
-            resources.extend(client_resources.resources)
-        except Exception as e:
-            logger.error(f"Error listing resources for {name}: {e}")
+    for client_resources in results.values():
+        resources.extend(client_resources.resources)
     return resources
 
 
 @server.list_resource_templates()
 async def list_resource_templates() -> list[types.ResourceTemplate]:
-    return []
+    return ClientManager.get_resource_templates()
 
 
 @server.list_tools()
 async def list_tools() -> list[types.Tool]:
-    tools = []
-    for name, client in ClientManager.get_clients():
-        # if client is None, then we cannot list the tools
-        if client is None:
-            logger.error(f"Client '{name}' not found")
-            continue
+    results, omitted = await ClientManager.fan_out(
+        lambda client: client.list_tools(), ClientManager.tools_snapshot
+    )
+    log_omitted("tools", omitted)
 
-        client_tools = await client.list_tools()
+    tools = []
+    for client_tools in results.values():
         tools.extend(client_tools.tools)
     return tools
 
@@ -81,29 +86,26 @@ async def get_prompt(name: str, args: dict[str, str] | None) -> types.GetPromptR
 
 @server.read_resource()
 async def handle_read_resource(uri: AnyUrl) -> str | bytes:
-    for name, client in ClientManager.get_clients():
-        try:
-            client_resources = await client.list_resources()
-            if str(uri) in map(lambda x: str(x.uri), client_resources.resources):
-                response = await client.read_resource(uri)
-                for resource in response:
-                    if resource.mimeType == "text/plain":
-                        assert isinstance(resource, types.TextResourceContents)
-                        assert type(resource.text) is str
-                        return resource.text
-
-                    elif resource.mimeType == "application/octet-stream":
-                        assert isinstance(resource, types.BlobResourceContents)
-                        assert type(resource.blob) is bytes
-                        return resource.blob
-
-                    else:
-                        raise Exception(
-                            f"Unsupported resource type: {resource.mimeType}"
-                        )
-
-        except Exception as e:
-            logger.error(f"Error listing resources for {name}: {e}")
+    client = await ClientManager.get_client_from_resource(str(uri))
+
+    # if client is None, then no server has the resource
+    if client is None:
+        raise Exception(f"Resource '{uri}' not found")
+
+    response = await client.read_resource(uri)
+    for resource in response:
+        if resource.mimeType == "text/plain":
+            assert isinstance(resource, types.TextResourceContents)
+            assert type(resource.text) is str
+            return resource.text
+
+        elif resource.mimeType == "application/octet-stream":
+            assert isinstance(resource, types.BlobResourceContents)
+            assert type(resource.blob) is bytes
+            return resource.blob
+
+        else:
+            raise Exception(f"Unsupported resource type: {resource.mimeType}")
 
     raise Exception(f"Resource '{uri}' not found")
 
@@ -0,0 +1,187 @@
+"""
+
+Session registry for the SSE transport
+
+the SSE stream of a session lives in the worker that accepted the GET, but the
+POSTs for that session can land on any worker. the relay finds the worker that
+owns a session and hands it the posted message.
+
+"""
+
+import asyncio
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Awaitable, Callable
+from uuid import UUID
+
+from fastapi.responses import Response
+from loguru import logger
+
+from mcp_bridge.config.final import SseServer
+
+__all__ = [
+    "SessionRelay",
+    "LocalSessionRelay",
+    "UnixSocketSessionRelay",
+    "create_relay",
+]
+
+# delivers a posted message body to a session owned by this worker
+Deliver = Callable[[UUID, bytes], Awaitable[Response]]
+
+
+class SessionRelay(ABC):
+    """Tracks which worker owns a session and forwards messages to it"""
+
+    @abstractmethod
+    async def register(self, session_id: UUID, deliver: Deliver) -> None:
+        """Claim a session for this worker, messages for it are passed to deliver"""
+        pass
+
+    @abstractmethod
+    async def unregister(self, session_id: UUID) -> None:
+        pass
+
+    @abstractmethod
+    async def forward(self, session_id: UUID, body: bytes) -> Response | None:
+        """Send a message to the worker owning the session, None if there is none"""
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class LocalSessionRelay(SessionRelay):
+    """Single worker, every session is owned by this process"""
+
+    async def register(self, session_id: UUID, deliver: Deliver) -> None:
+        pass
+
+    async def unregister(self, session_id: UUID) -> None:
+        pass
+
+    async def forward(self, session_id: UUID, body: bytes) -> Response | None:
+        return None
+
+
+class UnixSocketSessionRelay(SessionRelay):
+    """
+    Relay between workers on the same host. Each worker listens on a unix
+    socket in `directory`, and each session has a file there naming the socket
+    of the worker that owns it.
+    """
+
+    def __init__(self, directory: str, connect_timeout: float = 5) -> None:
+        self._directory = Path(directory)
+        self._socket_path = self._directory / f"worker-{os.getpid()}.sock"
+        self._connect_timeout = connect_timeout
+        self._server: asyncio.AbstractServer | None = None
+        self._deliver: Deliver | None = None
+        self._lock = asyncio.Lock()
+
+    def _session_file(self, session_id: UUID) -> Path:
+        return self._directory / f"{session_id.hex}.session"
+
+    async def _listen(self) -> None:
+        async with self._lock:
+            if self._server is not None:
+                return
+
+            self._directory.mkdir(parents=True, exist_ok=True)
+            self._socket_path.unlink(missing_ok=True)
+            self._server = await asyncio.start_unix_server(
+                self._handle, path=str(self._socket_path)
+            )
+            logger.info(f"relaying SSE messages on {self._socket_path}")
+
+    async def register(self, session_id: UUID, deliver: Deliver) -> None:
+        self._deliver = deliver
+        await self._listen()
+
+        # write then rename, so other workers never read a partial file
+        session_file = self._session_file(session_id)
+        tmp_file = session_file.with_suffix(".tmp")
+        tmp_file.write_text(str(self._socket_path))
+        tmp_file.replace(session_file)
+
+    async def unregister(self, session_id: UUID) -> None:
+        self._session_file(session_id).unlink(missing_ok=True)
+
+    async def forward(self, session_id: UUID, body: bytes) -> Response | None:
+        session_file = self._session_file(session_id)
+        try:
+            owner = session_file.read_text()
+        except FileNotFoundError:
+            return None
+
+        # our own session, which has already ended
+        if owner == str(self._socket_path):
+            return None
+
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_unix_connection(owner), self._connect_timeout
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            # the owning worker is gone, so is its session
+            logger.warning(f"could not reach the worker for session {session_id}: {e}")
+            session_file.unlink(missing_ok=True)
+            return None
+
+        try:
+            writer.write(f"{session_id.hex} {len(body)}\n".encode() + body)
+            await writer.drain()
+
+            status = int(await reader.readline())
+            content = await reader.read()
+        except (OSError, ValueError) as e:
+            # the owner died mid request or answered without a status line
+            logger.error(f"bad relay response for session {session_id} from {owner}: {e}")
+            return Response("Bad response from the worker owning the session", status_code=502)
+        finally:
+            writer.close()
+
+        logger.debug(f"relayed message for session {session_id} to {owner}")
+        return Response(content, status_code=status)
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            try:
+                session_hex, length = (await reader.readline()).decode().split()
+                body = await reader.readexactly(int(length))
+
+                assert self._deliver is not None
+                response = await self._deliver(UUID(hex=session_hex), body)
+
+            except (ValueError, asyncio.IncompleteReadError) as e:
+                logger.warning(f"could not parse relayed SSE message: {e}")
+                response = Response("Could not parse message", status_code=400)
+            except Exception as e:
+                logger.error(f"failed to handle relayed SSE message: {e}")
+                response = Response("Could not deliver message", status_code=500)
+
+            # the forwarding worker always gets a status line to pass on
+            writer.write(f"{response.status_code}\n".encode() + response.body)
+            await writer.drain()
+
+        except OSError as e:
+            logger.error(f"failed to answer relayed SSE message: {e}")
+        finally:
+            writer.close()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+        self._socket_path.unlink(missing_ok=True)
+
+
+def create_relay(config: SseServer) -> SessionRelay:
+    if config.relay == "unix":
+        return UnixSocketSessionRelay(config.relay_dir)
+
+    return LocalSessionRelay()
@@ -2,15 +2,30 @@ import asyncio
 from anyio import BrokenResourceError
 from fastapi.responses import StreamingResponse
 from .sse_transport import SseServerTransport
-from fastapi import APIRouter, Request
+from .session_registry import create_relay
+from fastapi import APIRouter, Request, Response
 from pydantic import ValidationError
 from loguru import logger
 
+from mcp_bridge.config import config
 from .server import server, options
 
 router = APIRouter(prefix="/sse")
 
-sse = SseServerTransport("/mcp-server/sse/messages")
+class SentResponse(Response):
+    """The transport has already sent the SSE response, there is nothing left to send"""
+
+    async def __call__(self, scope, receive, send) -> None:
+        pass
+
+
+sse = SseServerTransport(
+    "/mcp-server/sse/messages",
+    buffer_size=config.sse_server.buffer_size,
+    overflow=config.sse_server.overflow,
+    idle_timeout=config.sse_server.idle_timeout,
+    relay=create_relay(config.sse_server),
+)
 
 
 @router.get("/", response_class=StreamingResponse)
@@ -28,10 +43,12 @@ async def handle_sse(request: Request):
         except Exception:
             raise
     await request.close()
+    return SentResponse()
 
 
 @router.post("/messages")
 async def handle_messages(request: Request):
     logger.info("incoming SSE message received")
-    await sse.handle_post_message(request.scope, request.receive, request._send)
+    response = await sse.handle_post_message(request.scope, request.receive, request._send)
     await request.close()
+    return response
@@ -5,10 +5,20 @@ They try to directly contron the ASGI lifespan which causes issues with fastapi
 
 also switched the logger to loguru since we are vendoring it anyway
 
+the streams are bounded instead of zero capacity so a slow SSE consumer does
+not stall the POST handler, and sessions are cleaned up when they end
+
+POSTs for sessions owned by another worker are passed on through the relay
+
+a POST can carry a JSON-RPC batch, its requests are handled concurrently by
+the server and each response is sent on the SSE stream once it is ready
+
 """
 
+import json
+import time
 from contextlib import asynccontextmanager
-from typing import Any
+from typing import Any, Literal
 from urllib.parse import quote
 from uuid import UUID, uuid4
 
@@ -24,6 +34,9 @@ import mcp.types as types
 
 from loguru import logger
 
+from mcp_bridge.metrics import metrics
+from .session_registry import LocalSessionRelay, SessionRelay
+
 logger.disable("mcp_server.sse_transport")
 
 
@@ -43,16 +56,34 @@ class SseServerTransport:
     _read_stream_writers: dict[
         UUID, MemoryObjectSendStream[types.JSONRPCMessage | Exception]
     ]
+    _last_activity: dict[UUID, float]
 
-    def __init__(self, endpoint: str) -> None:
+    def __init__(
+        self,
+        endpoint: str,
+        buffer_size: int = 0,
+        overflow: Literal["block", "reject"] = "block",
+        idle_timeout: float | None = None,
+        relay: SessionRelay | None = None,
+    ) -> None:
         """
         Creates a new SSE server transport, which will direct the client to POST
         messages to the relative or absolute URL given.
+
+        Each session buffers up to `buffer_size` messages per direction. When the
+        buffer is full POSTs wait for room (`block`) or are answered with a 503
+        (`reject`). Sessions without messages for `idle_timeout` seconds are closed.
+        POSTs for sessions of other workers are forwarded through `relay`.
         """
 
         super().__init__()
         self._endpoint = endpoint
+        self._buffer_size = buffer_size
+        self._overflow = overflow
+        self._idle_timeout = idle_timeout
         self._read_stream_writers = {}
+        self._last_activity = {}
+        self._relay = relay or LocalSessionRelay()
         logger.debug(f"SseServerTransport initialized with endpoint: {endpoint}")
 
     @asynccontextmanager
@@ -68,44 +99,93 @@ class SseServerTransport:
         write_stream: MemoryObjectSendStream[types.JSONRPCMessage]
         write_stream_reader: MemoryObjectReceiveStream[types.JSONRPCMessage]
 
-        read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
-        write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+        read_stream_writer, read_stream = anyio.create_memory_object_stream(
+            self._buffer_size
+        )
+        write_stream, write_stream_reader = anyio.create_memory_object_stream(
+            self._buffer_size
+        )
 
         session_id = uuid4()
         session_uri = f"{quote(self._endpoint)}?session_id={session_id.hex}"
         self._read_stream_writers[session_id] = read_stream_writer
+        self._last_activity[session_id] = time.monotonic()
+        metrics.set_gauge("sse_sessions", len(self._read_stream_writers))
         logger.debug(f"Created new session with ID: {session_id}")
 
+        try:
+            await self._relay.register(session_id, self._deliver)
+        except Exception:
+            del self._read_stream_writers[session_id]
+            del self._last_activity[session_id]
+            metrics.set_gauge("sse_sessions", len(self._read_stream_writers))
+            raise
+
         sse_stream_writer, sse_stream_reader = anyio.create_memory_object_stream(
-            0, dict[str, Any]
+            self._buffer_size, dict[str, Any]
         )
 
+        # cancelled to end the SSE response cleanly, e.g. for idle sessions
+        writer_scope = anyio.CancelScope()
+
         async def sse_writer():
             logger.debug("Starting SSE writer")
             async with sse_stream_writer, write_stream_reader:
-                await sse_stream_writer.send({"event": "endpoint", "data": session_uri})
-                logger.debug(f"Sent endpoint event: {session_uri}")
-
-                async for message in write_stream_reader:
-                    logger.debug(f"Sending message via SSE: {message}")
-                    await sse_stream_writer.send(
-                        {
-                            "event": "message",
-                            "data": message.model_dump_json(
-                                by_alias=True, exclude_none=True
-                            ),
-                        }
-                    )
-
-        async with anyio.create_task_group() as tg:
-            response = EventSourceResponse(
-                content=sse_stream_reader, data_sender_callable=sse_writer
-            )
-            logger.debug("Starting SSE response task")
-            tg.start_soon(response, request.scope, request.receive, request._send)
-
-            logger.debug("Yielding read and write streams")
-            yield (read_stream, write_stream)
+                with writer_scope:
+                    await sse_stream_writer.send({"event": "endpoint", "data": session_uri})
+                    logger.debug(f"Sent endpoint event: {session_uri}")
+
+                    async for message in write_stream_reader:
+                        logger.debug(f"Sending message via SSE: {message}")
+                        self._last_activity[session_id] = time.monotonic()
+                        await sse_stream_writer.send(
+                            {
+                                "event": "message",
+                                "data": message.model_dump_json(
+                                    by_alias=True, exclude_none=True
+                                ),
+                            }
+                        )
+
+        async def reap_when_idle(idle_timeout: float):
+            while True:
+                idle = time.monotonic() - self._last_activity[session_id]
+                if idle >= idle_timeout:
+                    # the session ends once the response is finished
+                    logger.info(f"closing idle SSE session {session_id}")
+                    writer_scope.cancel()
+                    return
+
+                await anyio.sleep(idle_timeout - idle)
+
+        try:
+            async with anyio.create_task_group() as tg:
+                response = EventSourceResponse(
+                    content=sse_stream_reader, data_sender_callable=sse_writer
+                )
+
+                async def run_response():
+                    await response(request.scope, request.receive, request._send)
+                    # the client disconnected, so the session ends with it
+                    logger.debug(f"SSE response for session {session_id} ended")
+                    tg.cancel_scope.cancel()
+
+                logger.debug("Starting SSE response task")
+                tg.start_soon(run_response)
+
+                if self._idle_timeout is not None:
+                    tg.start_soon(reap_when_idle, self._idle_timeout)
+
+                logger.debug("Yielding read and write streams")
+                yield (read_stream, write_stream)
+
+        finally:
+            await self._relay.unregister(session_id)
+            del self._read_stream_writers[session_id]
+            del self._last_activity[session_id]
+            await read_stream_writer.aclose()
+            metrics.set_gauge("sse_sessions", len(self._read_stream_writers))
+            logger.debug(f"Removed session with ID: {session_id}")
 
     async def handle_post_message(
         self, scope: Scope, receive: Receive, send: Send
@@ -127,25 +207,82 @@ class SseServerTransport:
             response = Response("Invalid session ID", status_code=400)
             return response
 
+        body = await request.body()
+        if session_id in self._read_stream_writers:
+            return await self._deliver(session_id, body)
+
+        # the session may belong to another worker
+        response = await self._relay.forward(session_id, body)
+        if response is None:
+            logger.warning(f"Could not find session for ID: {session_id}")
+            response = Response("Could not find session", status_code=404)
+
+        return response
+
+    async def _deliver(self, session_id: UUID, body: bytes) -> Response:
+        """Pass a posted message to a session owned by this worker"""
+
         writer = self._read_stream_writers.get(session_id)
         if not writer:
             logger.warning(f"Could not find session for ID: {session_id}")
             response = Response("Could not find session", status_code=404)
             return response
 
-        json = await request.json()
-        logger.debug(f"Received JSON: {json}")
+        try:
+            payload = json.loads(body)
+        except json.JSONDecodeError as err:
+            logger.error(f"Failed to parse message: {err}")
+            return Response("Could not parse message", status_code=400)
+
+        logger.debug(f"Received JSON: {payload}")
+
+        if isinstance(payload, list) and not payload:
+            logger.warning("Received an empty batch")
+            return Response("Batch is empty", status_code=400)
 
         try:
-            message = types.JSONRPCMessage.model_validate(json)
-            logger.debug(f"Validated client message: {message}")
+            # a batch is all or nothing, so validate every message first
+            messages = [
+                types.JSONRPCMessage.model_validate(item)
+                for item in (payload if isinstance(payload, list) else [payload])
+            ]
+            logger.debug(f"Validated client messages: {messages}")
         except ValidationError as err:
             logger.error(f"Failed to parse message: {err}")
             response = Response("Could not parse message", status_code=400)
             await writer.send(err)
             return response
 
-        logger.debug(f"Sending message to writer: {message}")
+        logger.debug(f"Sending {len(messages)} messages to writer")
+        if session_id in self._last_activity:
+            self._last_activity[session_id] = time.monotonic()
+
+        try:
+            if self._overflow == "reject":
+                # take a batch only if all of it fits, never half of it
+                stats = writer.statistics()
+                room = stats.max_buffer_size - stats.current_buffer_used
+                if len(messages) > 1 and len(messages) > room:
+                    raise anyio.WouldBlock
+
+                for message in messages:
+                    writer.send_nowait(message)
+            else:
+                # waits for room in the buffer, slowing down the client
+                for message in messages:
+                    await writer.send(message)
+
+        except anyio.WouldBlock:
+            logger.warning(f"Session {session_id} is full, rejecting message")
+            metrics.increment("sse_messages_rejected")
+            return Response("Session is busy", status_code=503)
+
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            logger.warning(f"Session {session_id} closed while sending")
+            return Response("Could not find session", status_code=404)
+
         response = Response("Accepted", status_code=202)
-        await writer.send(message)
         return response
+
+    async def close(self) -> None:
+        await self._relay.close()
@@ -0,0 +1,153 @@
+"""
+
+Stateless Streamable HTTP transport for the bridge MCP server
+
+every POST is answered on its own, without a session, so any worker or replica
+can serve any request. this means there is no stream for server initiated
+messages, which the bridge does not send anyway.
+
+"""
+
+import asyncio
+import json
+from typing import Any, get_args
+
+from fastapi import APIRouter, Request, Response
+from loguru import logger
+from mcp import McpError, types
+from mcp.shared.version import SUPPORTED_PROTOCOL_VERSIONS
+from pydantic import ValidationError
+
+from .server import server, options
+
+router = APIRouter(prefix="/mcp")
+
+# methods a client may call, taken from the method literal of each request type
+CLIENT_METHODS = {
+    get_args(request_type.model_fields["method"].annotation)[0]
+    for request_type in get_args(types.ClientRequest.model_fields["root"].annotation)
+}
+
+
+def initialize(request: types.InitializeRequest) -> types.ServerResult:
+    # without a session there is nothing to set up, just agree on a version
+    version = request.params.protocolVersion
+    if version not in SUPPORTED_PROTOCOL_VERSIONS:
+        version = types.LATEST_PROTOCOL_VERSION
+
+    return types.ServerResult(
+        types.InitializeResult(
+            protocolVersion=version,
+            capabilities=options.capabilities,
+            serverInfo=types.Implementation(
+                name=options.server_name, version=options.server_version
+            ),
+            instructions=options.instructions,
+        )
+    )
+
+
+async def dispatch(message: types.JSONRPCRequest) -> types.JSONRPCMessage:
+    """Run a single request against the MCP server handlers"""
+
+    def error(code: int, text: str) -> types.JSONRPCMessage:
+        return types.JSONRPCMessage(
+            types.JSONRPCError(
+                jsonrpc="2.0",
+                id=message.id,
+                error=types.ErrorData(code=code, message=text),
+            )
+        )
+
+    if message.method not in CLIENT_METHODS:
+        return error(types.METHOD_NOT_FOUND, "Method not found")
+
+    try:
+        request = types.ClientRequest.model_validate(
+            message.model_dump(by_alias=True, mode="json", exclude_none=True)
+        ).root
+    except ValidationError as e:
+        return error(types.INVALID_PARAMS, f"Invalid params: {e.errors()[0]['msg']}")
+
+    try:
+        if isinstance(request, types.InitializeRequest):
+            result = initialize(request)
+        elif type(request) in server.request_handlers:
+            result = await server.request_handlers[type(request)](request)
+        else:
+            return error(types.METHOD_NOT_FOUND, "Method not found")
+
+    except McpError as e:
+        return error(e.error.code, e.error.message)
+    except Exception as e:
+        # same as the lowlevel server does for the SSE transport
+        logger.error(f"error handling {message.method}: {e}")
+        return error(0, str(e))
+
+    return types.JSONRPCMessage(
+        types.JSONRPCResponse(
+            jsonrpc="2.0",
+            id=message.id,
+            result=result.model_dump(by_alias=True, mode="json", exclude_none=True),
+        )
+    )
+
+
+def parse_messages(payload: Any) -> list[types.JSONRPCMessage]:
+    """Parse a JSON-RPC message or batch"""
+
+    if isinstance(payload, list):
+        return [types.JSONRPCMessage.model_validate(item) for item in payload]
+
+    return [types.JSONRPCMessage.model_validate(payload)]
+
+
+def error_response(code: int, message: str) -> Response:
+    # the id is unknown, which JSONRPCError does not allow
+    error = {"code": code, "message": message}
+    return Response(
+        json.dumps({"jsonrpc": "2.0", "id": None, "error": error}),
+        status_code=400,
+        media_type="application/json",
+    )
+
+
+@router.post("")
+async def handle_post(request: Request):
+    try:
+        payload = await request.json()
+    except json.JSONDecodeError as e:
+        logger.warning(f"could not parse MCP message: {e}")
+        return error_response(types.PARSE_ERROR, "Parse error")
+
+    # valid JSON that is not a valid message or batch
+    if payload == []:
+        logger.warning("received an empty MCP batch")
+        return error_response(types.INVALID_REQUEST, "Invalid Request")
+
+    try:
+        messages = parse_messages(payload)
+    except ValidationError as e:
+        logger.warning(f"invalid MCP message: {e}")
+        return error_response(types.INVALID_REQUEST, "Invalid Request")
+
+    # notifications and responses need no answer in stateless mode
+    requests = [m.root for m in messages if isinstance(m.root, types.JSONRPCRequest)]
+    if not requests:
+        return Response(status_code=202)
+
+    # requests of a batch run concurrently
+    responses = await asyncio.gather(*(dispatch(r) for r in requests))
+    body = [r.model_dump(by_alias=True, mode="json", exclude_none=True) for r in responses]
+
+    return Response(
+        json.dumps(body if isinstance(payload, list) else body[0]),
+        media_type="application/json",
+    )
+
+
+@router.get("")
+@router.delete("")
+async def handle_unsupported():
+    # there are no sessions or server initiated messages to stream
+    return Response(status_code=405, headers={"Allow": "POST"})
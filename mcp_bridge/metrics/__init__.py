@@ -0,0 +1,4 @@
+from .router import router
+from .manager import metrics
+
+__all__ = ["router", "metrics"]
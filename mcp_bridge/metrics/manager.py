@@ -0,0 +1,56 @@
+from .types import MetricSample, MetricsResponse, MetricSummary
+
+__all__ = ["metrics"]
+
+MetricKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+def _key(name: str, labels: dict[str, str]) -> MetricKey:
+    return name, tuple(sorted(labels.items()))
+
+
+def _samples(values: dict[MetricKey, float]) -> list[MetricSample]:
+    return [
+        MetricSample(name=name, labels=dict(labels), value=value)
+        for (name, labels), value in sorted(values.items())
+    ]
+
+
+class MetricsManager:
+    """Keeps in-process counters, gauges and summaries"""
+
+    counters: dict[MetricKey, float] = {}
+    gauges: dict[MetricKey, float] = {}
+    summaries: dict[MetricKey, MetricSummary] = {}
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        key = _key(name, labels)
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        self.gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = _key(name, labels)
+        summary = self.summaries.get(key)
+        if summary is None:
+            self.summaries[key] = MetricSummary(
+                name=name, labels=labels, count=1, sum=value, min=value, max=value, last=value
+            )
+            return
+
+        summary.count += 1
+        summary.sum += value
+        summary.min = min(summary.min, value)
+        summary.max = max(summary.max, value)
+        summary.last = value
+
+    def snapshot(self) -> MetricsResponse:
+        return MetricsResponse(
+            counters=_samples(self.counters),
+            gauges=_samples(self.gauges),
+            summaries=[self.summaries[key].model_copy() for key in sorted(self.summaries)],
+        )
+
+
+metrics: MetricsManager = MetricsManager()
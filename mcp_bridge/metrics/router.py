@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from .types import MetricsResponse
+from .manager import metrics
+from mcp_bridge.openapi_tags import Tag
+
+router = APIRouter(tags=[Tag.metrics])
+
+
+@router.get("/metrics", response_model=MetricsResponse)
+async def get_metrics():
+    """Metrics endpoint"""
+    return metrics.snapshot()
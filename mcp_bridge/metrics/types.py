@@ -0,0 +1,39 @@
+from pydantic import BaseModel, Field
+
+
+class MetricSample(BaseModel):
+    """Represents the current value of a counter or gauge"""
+
+    name: str = Field(..., description="Name of the metric")
+    labels: dict[str, str] = Field(
+        default_factory=dict, description="Labels of the metric"
+    )
+    value: float = Field(..., description="Current value of the metric")
+
+
+class MetricSummary(BaseModel):
+    """Represents the observations of a latency or size metric"""
+
+    name: str = Field(..., description="Name of the metric")
+    labels: dict[str, str] = Field(
+        default_factory=dict, description="Labels of the metric"
+    )
+    count: int = Field(..., description="Number of observations")
+    sum: float = Field(..., description="Sum of the observations")
+    min: float = Field(..., description="Smallest observation")
+    max: float = Field(..., description="Largest observation")
+    last: float = Field(..., description="Most recent observation")
+
+
+class MetricsResponse(BaseModel):
+    """Represents a snapshot of all metrics"""
+
+    counters: list[MetricSample] = Field(
+        default_factory=list, description="Monotonic counters"
+    )
+    gauges: list[MetricSample] = Field(
+        default_factory=list, description="Point in time values"
+    )
+    summaries: list[MetricSummary] = Field(
+        default_factory=list, description="Summaries of observed values"
+    )
@@ -0,0 +1,15 @@
+from typing import Any, Optional
+from pydantic import BaseModel, Field
+from mcp.types import CallToolResult
+
+
+class ToolBatchCall(BaseModel):
+    tool: str = Field(..., description="Name of the tool to call")
+    arguments: dict[str, Any] = Field({}, description="Arguments for the tool")
+
+
+class ToolBatchResult(BaseModel):
+    index: int = Field(..., description="Position of the call in the batch")
+    tool: Optional[str] = Field(None, description="Name of the called tool")
+    result: Optional[CallToolResult] = Field(None, description="Result of the tool call")
+    error: Optional[str] = Field(None, description="Why the call failed, if it did")
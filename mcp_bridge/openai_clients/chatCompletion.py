@@ -4,12 +4,14 @@ from lmos_openai_types import (
     ChatCompletionRequestMessage,
 )
 
-from .utils import call_tool, chat_completion_add_tools
+from .utils import (
+    call_tools,
+    chat_completion_add_tools,
+    tool_result_message,
+)
 from .genericHttpxClient import client
-from mcp_bridge.mcp_clients.McpClientManager import ClientManager
-from mcp_bridge.tool_mappers import mcp2openai
+from .requestBody import ChatCompletionBody
 from loguru import logger
-import json
 
 
 async def chat_completions(
@@ -17,7 +19,8 @@ async def chat_completions(
 ) -> CreateChatCompletionResponse:
     """performs a chat completion using the inference server"""
 
-    request = await chat_completion_add_tools(request)
+    request, tools_json = await chat_completion_add_tools(request)
+    body = ChatCompletionBody(request, tools_json)
 
     while True:
         # logger.debug(request.model_dump_json())
@@ -25,10 +28,7 @@ async def chat_completions(
         text = (
             await client.post(
                 "/chat/completions",
-                #content=request.model_dump_json(
-                #    exclude_defaults=True, exclude_none=True, exclude_unset=True
-                #),
-                json=request.model_dump(exclude_defaults=True, exclude_none=True, exclude_unset=True),
+                content=body.encode(),
             )
         ).text
         logger.debug(text)
@@ -45,7 +45,7 @@ async def chat_completions(
             content=msg.content,
             tool_calls=msg.tool_calls,
         )  # type: ignore
-        request.messages.append(msg)
+        body.append(msg)
 
         logger.debug(f"finish reason: {response.choices[0].finish_reason}")
         if response.choices[0].finish_reason.value in ["stop", "length"]:
@@ -53,40 +53,16 @@ async def chat_completions(
             return response
 
         logger.debug("tool calls found")
-        for tool_call in response.choices[0].message.tool_calls.root:
-            logger.debug(
-                f"tool call: {tool_call.function.name} arguments: {json.loads(tool_call.function.arguments)}"
-            )
-
-            # FIXME: this can probably be done in parallel using asyncio gather
-            tool_call_result = await call_tool(
-                tool_call.function.name, tool_call.function.arguments
-            )
-            if tool_call_result is None:
-                continue
+        tool_calls = response.choices[0].message.tool_calls.root
+        results = await call_tools(tool_calls)
 
+        # results come back in call order, so the tool messages keep the
+        # order of their tool_call_id in the assistant message
+        for tool_call, tool_call_result in zip(tool_calls, results):
             logger.debug(
                 f"tool call result for {tool_call.function.name}: {tool_call_result.model_dump()}"
             )
 
-            logger.debug(f"tool call result content: {tool_call_result.content}")
-
-            tools_content = [
-                {"type": "text", "text": part.text}
-                for part in filter(lambda x: x.type == "text", tool_call_result.content)
-            ]
-            if len(tools_content) == 0:
-                tools_content = [
-                    {"type": "text", "text": "the tool call result is empty"}
-                ]
-            request.messages.append(
-                ChatCompletionRequestMessage.model_validate(
-                    {
-                        "role": "tool",
-                        "content": tools_content,
-                        "tool_call_id": tool_call.id,
-                    }
-                )
-            )
+            body.append(tool_result_message(tool_call.id, tool_call_result))
 
-            logger.debug("sending next iteration of chat completion request")
+        logger.debug("sending next iteration of chat completion request")
@@ -0,0 +1,51 @@
+import json
+
+from lmos_openai_types import ChatCompletionRequestMessage, CreateChatCompletionRequest
+
+__all__ = ["ChatCompletionBody"]
+
+
+def _dump(model) -> str:
+    return json.dumps(
+        model.model_dump(exclude_defaults=True, exclude_none=True, exclude_unset=True)
+    )
+
+
+class ChatCompletionBody:
+    """
+    Serialized body of a chat completion request across the tool loop.
+
+    Messages are encoded once, when they are added, so every iteration only
+    encodes the new messages instead of the whole conversation.
+    """
+
+    def __init__(self, request: CreateChatCompletionRequest, tools_json: str) -> None:
+        self.request = request
+
+        fields = json.dumps(
+            request.model_dump(
+                exclude={"messages", "tools"},
+                exclude_defaults=True,
+                exclude_none=True,
+                exclude_unset=True,
+            )
+        )
+        # everything but the closing brace, the messages and tools go after it
+        self._prefix = fields[:-1] + (", " if fields != "{}" else "")
+        self._messages_json = ", ".join(_dump(msg) for msg in request.messages)
+        self._tools_json = tools_json
+
+    def append(self, message: ChatCompletionRequestMessage) -> None:
+        """Add a message to the request and its serialized body"""
+        self.request.messages.append(message)
+
+        encoded = _dump(message)
+        self._messages_json = (
+            f"{self._messages_json}, {encoded}" if self._messages_json else encoded
+        )
+
+    def encode(self) -> str:
+        return (
+            f'{self._prefix}"messages": [{self._messages_json}], '
+            f'"tools": {self._tools_json}}}'
+        )
@@ -1,4 +1,6 @@
+import asyncio
 import json
+import re
 from typing import Optional
 from fastapi import HTTPException
 from lmos_openai_types import (
@@ -8,17 +10,38 @@ from lmos_openai_types import (
     CreateChatCompletionStreamResponse,
     Function1,
 )
-from .utils import call_tool, chat_completion_add_tools
-from mcp_bridge.models import SSEData
+from .utils import (
+    call_tools,
+    chat_completion_add_tools,
+    run_limited_tool_call,
+    tool_call_limiter,
+    tool_result_message,
+)
+from mcp_bridge.config import config
+from mcp_bridge.metrics import metrics
 from .genericHttpxClient import client
-from mcp_bridge.mcp_clients.McpClientManager import ClientManager
-from mcp_bridge.tool_mappers import mcp2openai
+from .requestBody import ChatCompletionBody
 from loguru import logger
 from httpx_sse import aconnect_sse
 
 from sse_starlette.sse import EventSourceResponse, ServerSentEvent
 
 
+# cheap probes for the few fields the stream loop needs from each chunk
+FINISH_REASON_PATTERN = re.compile(r'"finish_reason"\s*:\s*"([^"]+)"')
+TOOL_CALLS_PATTERN = re.compile(r'"tool_calls"\s*:\s*\[')
+
+
+def response_content(chunks: list[str]) -> str:
+    """Rebuild the streamed message content from the raw chunks"""
+    content = ""
+    for chunk in chunks:
+        choices = json.loads(chunk).get("choices") or [{}]
+        content += (choices[0].get("delta") or {}).get("content") or ""
+
+    return content
+
+
 def is_valid_json(json_string: str) -> bool:
     """Check if a string is valid JSON"""
     try:
@@ -28,6 +51,89 @@ def is_valid_json(json_string: str) -> bool:
         return False
 
 
+class ToolCallBuffer:
+    """accumulates the streamed deltas of a single tool call"""
+
+    def __init__(self) -> None:
+        self.id: str = ""
+        self.name: str = ""
+        self.arguments: str = ""
+
+        # tracks when the arguments object closes without re-parsing it
+        self.closed: bool = False
+        self._depth: int = 0
+        self._in_string: bool = False
+        self._escaped: bool = False
+
+    def append_arguments(self, chunk: str) -> None:
+        self.arguments += chunk
+        if self.closed:
+            return
+
+        for char in chunk:
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.closed = True
+                    return
+
+    def to_tool_call(self) -> ChatCompletionMessageToolCall:
+        return ChatCompletionMessageToolCall(
+            id=self.id,
+            type="function",
+            # tools without parameters may stream no arguments at all
+            function=Function1(name=self.name, arguments=self.arguments or "{}"),
+        )
+
+
+def start_speculative_calls(
+    tool_calls: dict[int, ToolCallBuffer],
+    speculative: dict[int, asyncio.Task],
+    limiter: asyncio.Semaphore,
+) -> None:
+    """start tool calls whose arguments are complete while the stream goes on"""
+
+    last_index = max(tool_calls)
+    for index, buffer in tool_calls.items():
+        if index in speculative or not buffer.name:
+            continue
+
+        # a later tool call starting also means this one is finished
+        finished = buffer.closed or (
+            index < last_index and is_valid_json(buffer.arguments or "{}")
+        )
+        if not finished:
+            continue
+
+        logger.debug(f"speculatively calling {buffer.name}")
+        tool_call = buffer.to_tool_call()
+        speculative[index] = asyncio.create_task(
+            run_limited_tool_call(tool_call, limiter)
+        )
+
+
+def cancel_speculative_calls(speculative: dict[int, asyncio.Task]) -> None:
+    running = [task for task in speculative.values() if not task.done()]
+    for task in running:
+        task.cancel()
+
+    if running:
+        metrics.increment("speculative_calls_cancelled", len(running))
+
+    speculative.clear()
+
+
 async def streaming_chat_completions(request: CreateChatCompletionRequest):
     # raise NotImplementedError("Streaming Chat Completion is not supported")
 
@@ -47,7 +153,8 @@ async def chat_completions(request: CreateChatCompletionRequest):
 
     request.stream = True
 
-    request = await chat_completion_add_tools(request)
+    request, tools_json = await chat_completion_add_tools(request)
+    body = ChatCompletionBody(request, tools_json)
 
     fully_done = False
     while not fully_done:
@@ -55,195 +162,196 @@ async def chat_completions(request: CreateChatCompletionRequest):
         #     exclude_defaults=True, exclude_none=True, exclude_unset=True
         # )
 
-        json_data = json.dumps(request.model_dump(
-            exclude_defaults=True, exclude_none=True, exclude_unset=True
-        ))
+        json_data = body.encode()
 
         # logger.debug(json_data)
 
-        last: Optional[CreateChatCompletionStreamResponse] = None  # last message
+        finish_reason: Optional[str] = None
+        chunks: list[str] = []
 
-        tool_call_name: str = ""
-        tool_call_json: str = ""
+        # tool calls are streamed as deltas keyed by their index
+        tool_calls: dict[int, ToolCallBuffer] = {}
+        # tool calls started before the stream finished, keyed by index
+        speculative: dict[int, asyncio.Task] = {}
+        # shared by the speculative and the remaining calls of this turn, so
+        # together they stay within tool_calls.max_parallel
+        limiter = tool_call_limiter()
         should_forward: bool = True
-        response_content: str = ""
-        tool_call_id: str = ""
 
-        async with aconnect_sse(
-            client, "post", "/chat/completions", content=json_data
-        ) as event_source:
+        try:
+            async with aconnect_sse(
+                client, "post", "/chat/completions", content=json_data
+            ) as event_source:
             
-            # check if the content type is correct because the aiter_sse method
-            # will raise an exception if the content type is not correct
-            if "Content-Type" in event_source.response.headers:
-                content_type = event_source.response.headers["Content-Type"]
-                if "text/event-stream" not in content_type:
-                    logger.error(f"Unexpected Content-Type: {content_type}")
-                    error_data = await event_source.response.aread()
-                    logger.error(f"Request URL: {event_source.response.url}")
-                    logger.error(f"Request Data: {json_data}")
-                    logger.error(f"Response Status: {event_source.response.status_code}")
-                    logger.error(f"Response Data: {error_data.decode(event_source.response.encoding or 'utf-8')}")
-                    raise HTTPException(status_code=500, detail="Unexpected Content-Type")
-
-            # iterate over the SSE stream
-            async for sse in event_source.aiter_sse():
-                event = sse.event
-                data = sse.data
-                id = sse.id
-                retry = sse.retry
+                # check if the content type is correct because the aiter_sse method
+                # will raise an exception if the content type is not correct
+                if "Content-Type" in event_source.response.headers:
+                    content_type = event_source.response.headers["Content-Type"]
+                    if "text/event-stream" not in content_type:
+                        logger.error(f"Unexpected Content-Type: {content_type}")
+                        error_data = await event_source.response.aread()
+                        logger.error(f"Request URL: {event_source.response.url}")
+                        logger.error(f"Request Data: {json_data}")
+                        logger.error(f"Response Status: {event_source.response.status_code}")
+                        logger.error(f"Response Data: {error_data.decode(event_source.response.encoding or 'utf-8')}")
+                        raise HTTPException(status_code=500, detail="Unexpected Content-Type")
+
+                # iterate over the SSE stream
+                async for sse in event_source.aiter_sse():
+                    data = sse.data
+
+                    logger.debug(
+                        "event: {},\ndata: {},\nid: {},\nretry: {}",
+                        sse.event, data, sse.id, sse.retry,
+                    )
 
-                logger.debug(
-                    f"event: {event},\ndata: {data},\nid: {id},\nretry: {retry}"
-                )
+                    # handle if the SSE stream is done
+                    if data == "[DONE]":
+                        logger.debug("inference serverstream done")
+                        break
+
+                    # the raw chunks are kept so the content can be rebuilt
+                    # only if the round ends in tool calls
+                    chunks.append(data)
+
+                    # probe the raw chunk instead of validating every token
+                    reason_match = FINISH_REASON_PATTERN.search(data)
+                    if reason_match is not None:
+                        # for some reason openrouter uses uppercase for finish_reason
+                        finish_reason = reason_match.group(1).lower()
+                        if finish_reason in ["stop", "length"]:
+                            fully_done = True
+                        else:
+                            should_forward = False
+
+                    # this manages the incoming tool call schema
+                    if TOOL_CALLS_PATTERN.search(data) is not None:
+                        should_forward = False
 
-                # handle if the SSE stream is done
-                if data == "[DONE]":
-                    logger.debug("inference serverstream done")
-                    break
+                        try:
+                            parsed_data = CreateChatCompletionStreamResponse.model_validate_json(
+                                data
+                            )
+                        except Exception as e:
+                            logger.debug(data)
+                            raise e
 
-                # for some reason openrouter uses uppercase for finish_reason
-                try:
-                    data['choices'][0]['finish_reason'] = data['choices'][0]['finish_reason'].lower() # type: ignore
-                except Exception as e:
-                    logger.debug(f"failed to lowercase finish_reason: {e}")
+                        for delta in parsed_data.choices[0].delta.tool_calls or []:
+                            buffer = tool_calls.setdefault(delta.index, ToolCallBuffer())
 
-                try:
-                    parsed_data = CreateChatCompletionStreamResponse.model_validate_json(
-                        data
-                    )
-                except Exception as e:
-                    logger.debug(data)
-                    raise e
-
-                # add the delta to the response content
-                content = parsed_data.choices[0].delta.content
-                content = content if content is not None else ""
-                response_content += content
-
-                # handle stop reasons
-                if parsed_data.choices[0].finish_reason is not None:
-                    if parsed_data.choices[0].finish_reason.value in [
-                        "stop",
-                        "length",
-                    ]:
-                        fully_done = True
-                    else:
-                        should_forward = False
+                            if delta.id:
+                                buffer.id = delta.id
 
-                # this manages the incoming tool call schema
-                # most of this is assertions to please mypy
-                if parsed_data.choices[0].delta.tool_calls is not None:
-                    should_forward = False
-                    assert (
-                        parsed_data.choices[0].delta.tool_calls[0].function is not None
-                    )
+                            if delta.function is None:
+                                continue
 
-                    name = parsed_data.choices[0].delta.tool_calls[0].function.name
-                    name = name if name is not None else ""
-                    tool_call_name = name if tool_call_name == "" else tool_call_name
+                            if delta.function.name and not buffer.name:
+                                buffer.name = delta.function.name
 
-                    call_id = parsed_data.choices[0].delta.tool_calls[0].id
-                    call_id = call_id if call_id is not None else ""
-                    tool_call_id = id if tool_call_id == "" else tool_call_id
+                            if delta.function.arguments:
+                                buffer.append_arguments(delta.function.arguments)
 
-                    arg = parsed_data.choices[0].delta.tool_calls[0].function.arguments
-                    tool_call_json += arg if arg is not None else ""
+                        if config.tool_calls.speculative:
+                            start_speculative_calls(tool_calls, speculative, limiter)
 
-                # forward SSE messages to the client
-                logger.debug(f"{should_forward=}")
-                if should_forward:
+                    # forward SSE messages to the client as they were received
                     # we do not want to forward tool call json to the client
-                    logger.debug("forwarding message")
-                    yield SSEData.model_validate_json(sse.data).model_dump_json()
+                    if should_forward:
+                        yield data
 
-                # save the last message
-                last = parsed_data
+        except asyncio.CancelledError:
+            # the client disconnected, leaving the context closes the upstream
+            # response so the inference server stops generating
+            logger.info("client disconnected, aborting the inference stream")
+            metrics.increment("upstream_streams_aborted")
+            cancel_speculative_calls(speculative)
+            raise
+
+        except BaseException:
+            cancel_speculative_calls(speculative)
+            raise
 
         # ideally we should check this properly
-        assert last is not None
-        assert last.choices[0].finish_reason is not None
+        assert finish_reason is not None
 
-        if last.choices[0].finish_reason.value in ["stop", "length"]:
+        if finish_reason in ["stop", "length"]:
             logger.debug("no tool calls found")
+            cancel_speculative_calls(speculative)
             fully_done = True
             continue
 
-        # Check if we have tool call content but incomplete JSON
-        if tool_call_name and not is_valid_json(tool_call_json):
-            logger.warning(f"Incomplete JSON for tool call {tool_call_name}, received so far: {tool_call_json}")
-            logger.warning(f"Finish reason was: {last.choices[0].finish_reason.value}")
-            
-            # Add a message explaining the tool call failure so LLM can respond
-            failure_msg = ChatCompletionRequestMessage(
-                role="user",
-                content=f"The tool call '{tool_call_name}' failed. Please just explain what happened and don't do any actions."
-            )
-            request.messages.append(failure_msg)
-            
-            # Continue the conversation instead of ending it
-            logger.info("Added failure explanation message, continuing conversation")
-            # Don't set fully_done = True, let the LLM respond to the failure
+        complete_calls = [
+            buffer for _, buffer in sorted(tool_calls.items()) if buffer.name
+        ]
+        if not complete_calls:
+            # No tool calls found, conversation is complete
+            cancel_speculative_calls(speculative)
+            fully_done = True
             continue
 
-        # Only proceed with tool calls if we have valid JSON
-        if tool_call_name and tool_call_json:
-            logger.debug("tool calls found")
-            logger.debug(f"{tool_call_name=} {tool_call_json=}")
+        logger.debug("tool calls found")
+
+        # tool calls with incomplete JSON cannot be run
+        valid_calls = [b for b in complete_calls if is_valid_json(b.arguments or "{}")]
+        failed_calls = [b for b in complete_calls if b not in valid_calls]
+        for index, buffer in tool_calls.items():
+            if buffer in failed_calls and index in speculative:
+                speculative.pop(index).cancel()
 
-            # Validate that tool_call_json is complete before processing
-            if not is_valid_json(tool_call_json):
-                logger.error(f"Invalid JSON for tool call {tool_call_name}: {tool_call_json}")
-                logger.error("Skipping tool call due to malformed JSON")
-                fully_done = True
-                continue
+        for buffer in failed_calls:
+            logger.warning(f"Incomplete JSON for tool call {buffer.name}, received so far: {buffer.arguments}")
+            logger.warning(f"Finish reason was: {finish_reason}")
 
+        if valid_calls:
             # add received message to the history
             msg = ChatCompletionRequestMessage(
                 role="assistant",
-                content=response_content,
-                tool_calls=[
-                    ChatCompletionMessageToolCall(
-                        id=tool_call_id,
-                        type="function",
-                        function=Function1(name=tool_call_name, arguments=tool_call_json),
-                    )
-                ],
+                content=response_content(chunks),
+                tool_calls=[buffer.to_tool_call() for buffer in valid_calls],
             )  # type: ignore
-            request.messages.append(msg)
-
-            #### MOST OF THIS IS COPY PASTED FROM CHAT_COMPLETIONS
-            # FIXME: this can probably be done in parallel using asyncio gather
-            tool_call_result = await call_tool(tool_call_name, tool_call_json)
-            if tool_call_result is None:
-                continue
+            body.append(msg)
 
-            logger.debug(
-                f"tool call result for {tool_call_name}: {tool_call_result.model_dump()}"
-            )
-
-            logger.debug(f"tool call result content: {tool_call_result.content}")
-
-            tools_content = [
-                {"type": "text", "text": part.text}
-                for part in filter(lambda x: x.type == "text", tool_call_result.content)
+            # every call of this round runs concurrently, reusing the calls
+            # that were already started while the model was streaming
+            pending = [
+                buffer for index, buffer in sorted(tool_calls.items())
+                if buffer in valid_calls and index not in speculative
             ]
-            if len(tools_content) == 0:
-                tools_content = [{"type": "text", "text": "the tool call result is empty"}]
-            request.messages.append(
-                ChatCompletionRequestMessage.model_validate(
-                    {
-                        "role": "tool",
-                        "content": tools_content,
-                        "tool_call_id": tool_call_id,
-                    }
+            # a disconnect cancels the pending calls through gather, the
+            # speculative ones have to be cancelled by hand
+            try:
+                pending_results = iter(
+                    await call_tools(
+                        [buffer.to_tool_call() for buffer in pending], limiter
+                    )
                 )
+                results = [
+                    await speculative[index] if index in speculative else next(pending_results)
+                    for index, buffer in sorted(tool_calls.items())
+                    if buffer in valid_calls
+                ]
+            except BaseException:
+                cancel_speculative_calls(speculative)
+                raise
+            for buffer, tool_call_result in zip(valid_calls, results):
+                logger.debug(
+                    f"tool call result for {buffer.name}: {tool_call_result.model_dump()}"
+                )
+                body.append(tool_result_message(buffer.id, tool_call_result))
+
+        if failed_calls:
+            # Add a message explaining the tool call failure so LLM can respond
+            names = ", ".join(f"'{buffer.name}'" for buffer in failed_calls)
+            failure_msg = ChatCompletionRequestMessage(
+                role="user",
+                content=f"The tool call {names} failed. Please just explain what happened and don't do any actions."
             )
+            body.append(failure_msg)
 
-            logger.debug("sending next iteration of chat completion request")
-        else:
-            # No tool calls found, conversation is complete
-            fully_done = True
+            # Continue the conversation instead of ending it
+            logger.info("Added failure explanation message, continuing conversation")
+
+        logger.debug("sending next iteration of chat completion request")
 
     # when done, send the final event
     logger.debug("sending final event")
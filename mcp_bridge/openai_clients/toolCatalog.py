@@ -0,0 +1,75 @@
+import asyncio
+import json
+import time
+
+from lmos_openai_types import ChatCompletionTool
+from loguru import logger
+
+from mcp_bridge.config import config
+from mcp_bridge.mcp_clients.McpClientManager import ClientManager
+from mcp_bridge.tool_mappers import mcp2openai
+
+__all__ = ["tool_catalog"]
+
+
+class ToolCatalogCache:
+    """
+    Caches the MCP tools converted to the OpenAI format, along with their
+    serialized JSON, so chat requests do not pay for listing or converting tools.
+
+    Stale entries are served while a rebuild runs in the background.
+    """
+
+    _version: int = -1
+    _tools: list[ChatCompletionTool] = []
+    _tools_json: str = "[]"
+    _rebuild_task: asyncio.Task | None = None
+    _revalidate_task: asyncio.Task | None = None
+
+    async def get(self) -> tuple[list[ChatCompletionTool], str]:
+        """Get the converted tools and their serialized JSON"""
+
+        self._maybe_revalidate()
+
+        if self._version != ClientManager.tools_version:
+            if self._version < 0:
+                # nothing to serve yet, so the first build has to be inline
+                self._rebuild()
+            elif self._rebuild_task is None or self._rebuild_task.done():
+                self._rebuild_task = asyncio.create_task(self._rebuild_soon())
+
+        return self._tools, self._tools_json
+
+    async def _rebuild_soon(self) -> None:
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        version = ClientManager.tools_version
+        tools = [mcp2openai(tool) for tool in ClientManager.get_tools()]
+        tools_json = json.dumps(
+            [
+                tool.model_dump(
+                    exclude_defaults=True, exclude_none=True, exclude_unset=True
+                )
+                for tool in tools
+            ]
+        )
+
+        self._tools, self._tools_json, self._version = tools, tools_json, version
+        logger.debug(f"rebuilt tool catalog with {len(tools)} tools")
+
+    def _maybe_revalidate(self) -> None:
+        """Re-list tools from the servers in the background once the ttl expires"""
+
+        age = time.monotonic() - ClientManager.tools_refreshed_at
+        if age < config.tool_catalog.ttl:
+            return
+
+        if self._revalidate_task is not None and not self._revalidate_task.done():
+            return
+
+        logger.debug("tool catalog is stale, revalidating in the background")
+        self._revalidate_task = asyncio.create_task(ClientManager.refresh_all_tools())
+
+
+tool_catalog = ToolCatalogCache()
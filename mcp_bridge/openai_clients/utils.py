@@ -1,31 +1,32 @@
+import asyncio
 from typing import Optional
 from loguru import logger
-from lmos_openai_types import CreateChatCompletionRequest
+from lmos_openai_types import (
+    ChatCompletionMessageToolCall,
+    ChatCompletionRequestMessage,
+    CreateChatCompletionRequest,
+)
 import mcp.types
 import json
 
+from mcp_bridge.config import config
 from mcp_bridge.mcp_clients.McpClientManager import ClientManager
-from mcp_bridge.tool_mappers import mcp2openai
+from .toolCatalog import tool_catalog
 
 
-async def chat_completion_add_tools(request: CreateChatCompletionRequest):
-    request.tools = []
+async def chat_completion_add_tools(
+    request: CreateChatCompletionRequest,
+) -> tuple[CreateChatCompletionRequest, str]:
+    """add the cached MCP tools to the request, returns the tools as JSON too"""
 
-    for _, session in ClientManager.get_clients():
-        # if session is None, then the client is not running
-        if session.session is None:
-            logger.error(f"session is `None` for {session.name}")
-            continue
+    tools, tools_json = await tool_catalog.get()
+    request.tools = list(tools)
 
-        tools = await session.session.list_tools()
-        for tool in tools.tools:
-            request.tools.append(mcp2openai(tool))
-
-    return request
+    return request, tools_json
 
 
 async def call_tool(
-    tool_call_name: str, tool_call_json: str, timeout: Optional[int] = None
+    tool_call_name: str, tool_call_json: str, timeout: Optional[float] = None
 ) -> Optional[mcp.types.CallToolResult]:
     if tool_call_name == "" or tool_call_name is None:
         logger.error("tool call name is empty")
@@ -50,3 +51,79 @@ async def call_tool(
         return None
 
     return await session.call_tool(tool_call_name, tool_call_args, timeout)
+
+
+def tool_error_result(message: str) -> mcp.types.CallToolResult:
+    return mcp.types.CallToolResult(
+        content=[mcp.types.TextContent(type="text", text=message)], isError=True
+    )
+
+
+async def run_tool_call(
+    tool_call: ChatCompletionMessageToolCall,
+) -> mcp.types.CallToolResult:
+    """call a tool, a failed call becomes an error result for the model"""
+
+    name = tool_call.function.name
+    logger.debug(f"tool call: {name} arguments: {tool_call.function.arguments}")
+
+    try:
+        result = await call_tool(name, tool_call.function.arguments)
+    except Exception as e:
+        # e.g. the HTTPException of a server that is offline
+        reason = getattr(e, "detail", None) or str(e) or type(e).__name__
+        logger.error(f"tool call {name} failed: {reason}")
+        return tool_error_result(f"the tool call {name} failed: {reason}")
+
+    # every tool call needs an answer, or the next request is rejected
+    if result is None:
+        return tool_error_result(f"the tool call {name} failed")
+
+    return result
+
+
+def tool_call_limiter() -> asyncio.Semaphore:
+    """limits the concurrent tool calls of a single model turn"""
+    return asyncio.Semaphore(config.tool_calls.max_parallel)
+
+
+async def run_limited_tool_call(
+    tool_call: ChatCompletionMessageToolCall, limiter: asyncio.Semaphore
+) -> mcp.types.CallToolResult:
+    async with limiter:
+        return await run_tool_call(tool_call)
+
+
+async def call_tools(
+    tool_calls: list[ChatCompletionMessageToolCall],
+    limiter: Optional[asyncio.Semaphore] = None,
+) -> list[mcp.types.CallToolResult]:
+    """run tool calls concurrently, the results are in the same order as the calls"""
+
+    if limiter is None:
+        limiter = tool_call_limiter()
+
+    return await asyncio.gather(
+        *(run_limited_tool_call(tool_call, limiter) for tool_call in tool_calls)
+    )
+
+
+def tool_result_message(
+    tool_call_id: str, tool_call_result: mcp.types.CallToolResult
+) -> ChatCompletionRequestMessage:
+    """convert a tool call result into a tool message for the model"""
+
+    tools_content = [
+        {"type": "text", "text": part.text}
+        for part in filter(lambda x: x.type == "text", tool_call_result.content)
+    ]
+    if len(tools_content) == 0:
+        tools_content = [{"type": "text", "text": "the tool call result is empty"}]
+
+    return ChatCompletionRequestMessage.model_validate(
+        {
+            "role": "tool",
+            "content": tools_content,
+            "tool_call_id": tool_call_id,
+        }
+    )
@@ -8,6 +8,7 @@ class Tag(str, Enum):
     mcp_server = "MCP Server APIs"
     openai = "OpenAI API Compatible APIs"
     health = "System Health API"
+    metrics = "System Metrics API"
 
 
 tags_metadata = [
@@ -27,4 +28,8 @@ tags_metadata = [
         "name": Tag.health,
         "description": "System health endpoints",
     },
+    {
+        "name": Tag.metrics,
+        "description": "System metrics endpoints",
+    },
 ]